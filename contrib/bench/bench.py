@@ -0,0 +1,266 @@
+"""
+End-to-end throughput benchmarks for the Chadwick tools.
+
+Each tool is run over all the event files for one season in a corpus
+directory (such as one written by gencorpus.py), once with its default
+fields and once with every field enabled, and the elapsed time of each
+run is recorded.  Results are written as JSON, so that runs on different
+builds can be compared:
+
+  python gencorpus.py -g 2430 corpus
+  python bench.py -b /path/to/build1/bin -o build1.json corpus
+  python bench.py -b /path/to/build2/bin -o build2.json corpus
+  python bench.py --compare build1.json build2.json
+
+The player predicate cases of cwevent are run both by scanning every
+game and with an index built by cwindex, for the player who appears as
+batter in the most games; the cwindex case times building that index.
+
+If the cwbench program (see the Makefile in this directory) is given with
+--cwbench, its micro-benchmarks of the library routines are run on the
+same corpus and included in the results.
+"""
+
+import atexit
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# (tool, name of field set, extra arguments).  In the arguments, {player}
+# and {index} are replaced by the player selected and the index file.
+CASES = [("cwevent", "default", []),
+         ("cwevent", "all", ["-f", "0-96", "-x", "0-63"]),
+         ("cwevent", "batter", ["--batter", "{player}"]),
+         ("cwevent", "batter-index", ["--batter", "{player}",
+                                      "--index", "{index}"]),
+         ("cwindex", "default", []),
+         ("cwgame", "default", []),
+         ("cwgame", "all", ["-f", "0-84", "-x", "0-96"]),
+         ("cwdaily", "default", []),
+         ("cwdaily", "all", ["-f", "0-153"]),
+         ("cwsub", "default", []),
+         ("cwsub", "all", ["-f", "0-24"]),
+         ("cwcomment", "default", []),
+         ("cwbox", "text", []),
+         ("cwbox", "xml", ["-X"])]
+
+
+def corpus_info(corpus, year):
+    """Count the files, games, and events for 'year' in 'corpus'."""
+    files = sorted(os.path.basename(f)
+                   for f in glob.glob(os.path.join(corpus, "%s*.EV?" % year)))
+    info = {"path": os.path.abspath(corpus), "year": year, "files": files,
+            "games": 0, "events": 0, "bytes": 0}
+    for name in files:
+        path = os.path.join(corpus, name)
+        info["bytes"] += os.path.getsize(path)
+        with open(path) as f:
+            for line in f:
+                if line.startswith("id,"):
+                    info["games"] += 1
+                elif line.startswith("play,"):
+                    info["events"] += 1
+    return info
+
+
+def children_cpu_time():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_case(command, corpus, repeats):
+    """
+    Run 'command' in 'corpus' 'repeats' times, discarding its output.
+    Returns lists of elapsed and processor times in seconds, or raises
+    RuntimeError if the command fails.
+    """
+    elapsed, cpu = [], []
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeats):
+            cpu_start = children_cpu_time()
+            start = time.time()
+            status = subprocess.call(command, cwd=corpus, stdout=devnull)
+            elapsed.append(time.time() - start)
+            if cpu_start is not None:
+                cpu.append(children_cpu_time() - cpu_start)
+            if status != 0:
+                raise RuntimeError("'%s' exited with status %d" %
+                                   (" ".join(command), status))
+    return elapsed, cpu
+
+
+def build_index(bindir, corpus, info, path):
+    """
+    Build a cwindex index of the corpus in 'path'.  Returns the player
+    who appears as batter in the most games, for the predicate cases.
+    """
+    cwindex = os.path.join(bindir, "cwindex") if bindir else "cwindex"
+    with open(path, "w") as f:
+        subprocess.check_call([cwindex, "-q"] + info["files"],
+                              cwd=corpus, stdout=f)
+    games = {}
+    with open(path) as f:
+        for line in f:
+            fields = line.split(",", 2)
+            if len(fields) == 3 and fields[1] == "B":
+                games[fields[0]] = games.get(fields[0], 0) + 1
+    if not games:
+        raise RuntimeError("index of %s is empty" % corpus)
+    return max(sorted(games), key=lambda player: games[player])
+
+
+def run_tools(bindir, corpus, info, repeats, tools=None):
+    results = []
+    subst = None
+    for (tool, fields, args) in CASES:
+        if tools and tool not in tools:
+            continue
+        path = os.path.join(bindir, tool) if bindir else tool
+        entry = {"tool": tool, "fields": fields, "args": args}
+        try:
+            if any("{" in arg for arg in args):
+                if subst is None:
+                    # The index is built once, and a build without cwindex
+                    # fails only the cases which need it
+                    index = tempfile.NamedTemporaryFile(suffix=".idx",
+                                                        delete=False)
+                    index.close()
+                    atexit.register(os.remove, index.name)
+                    try:
+                        subst = {"index": index.name,
+                                 "player": build_index(bindir, corpus, info,
+                                                       index.name)}
+                    except (OSError, subprocess.CalledProcessError) as e:
+                        subst = RuntimeError("building index: %s" % e)
+                if isinstance(subst, Exception):
+                    raise subst
+                entry["args"] = args = [arg.format(**subst) for arg in args]
+            # cwindex needs no season, as it reads no team or roster files
+            season = [] if tool == "cwindex" else ["-y", info["year"]]
+            command = [path, "-q"] + season + args + info["files"]
+            (elapsed, cpu) = run_case(command, corpus, repeats)
+        except (OSError, RuntimeError) as e:
+            sys.stderr.write("%s %s: %s\n" % (tool, fields, e))
+            entry["error"] = str(e)
+            results.append(entry)
+            continue
+        best = min(elapsed)
+        entry.update({"seconds": elapsed, "cpu_seconds": cpu, "best": best,
+                      "games_per_sec": info["games"] / best if best else None,
+                      "events_per_sec": info["events"] / best if best else None,
+                      "mb_per_sec": info["bytes"] / 1.0e6 / best if best else None})
+        sys.stderr.write("%-10s %-12s %8.3fs %10.0f events/s\n" %
+                         (tool, fields, best, entry["events_per_sec"] or 0))
+        results.append(entry)
+    return results
+
+
+def run_micro(cwbench, corpus, info, repetitions):
+    output = subprocess.check_output([os.path.abspath(cwbench),
+                                      "-y", info["year"],
+                                      "-n", str(repetitions)] + info["files"],
+                                     cwd=corpus)
+    return json.loads(output.decode("ascii"))
+
+
+def compare(baseline, results, stream=sys.stdout):
+    """Print the change in timings from 'baseline' to 'results'."""
+    def row(name, old, new):
+        if old and new:
+            stream.write("%-32s %12.4g %12.4g %+8.1f%%\n" %
+                         (name, old, new, 100.0 * (new - old) / old))
+        else:
+            stream.write("%-32s %12s %12s\n" % (name, old or "-", new or "-"))
+
+    stream.write("%-32s %12s %12s %9s\n" %
+                 ("Benchmark", baseline.get("label") or "baseline",
+                  results.get("label") or "results", "change"))
+    stream.write("-" * 68 + "\n")
+    old = dict(((e["tool"], e["fields"]), e) for e in baseline["tools"])
+    for entry in results["tools"]:
+        key = (entry["tool"], entry["fields"])
+        row("%s %s (s)" % key, old.get(key, {}).get("best"), entry.get("best"))
+
+    if baseline.get("micro") and results.get("micro"):
+        old = dict((b["name"], b) for b in baseline["micro"]["benchmarks"])
+        for bench in results["micro"]["benchmarks"]:
+            row("%s (ns/op)" % bench["name"],
+                old.get(bench["name"], {}).get("ns_per_op"), bench["ns_per_op"])
+
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Measure the throughput "
+                                     "of the Chadwick tools on a corpus.")
+    parser.add_argument("-b", dest="bindir", default="",
+                        help="directory containing the tools "
+                        "(default: search PATH)")
+    parser.add_argument("-y", dest="year", default="2023",
+                        help="season to process (default: 2023)")
+    parser.add_argument("-r", type=int, dest="repeats", default=3,
+                        help="runs of each tool; the fastest is reported "
+                        "(default: 3)")
+    parser.add_argument("-t", dest="tools", action="append", default=[],
+                        help="benchmark only this tool (repeatable)")
+    parser.add_argument("-l", dest="label", default="",
+                        help="label for this build in the results")
+    parser.add_argument("-o", dest="output", default=None,
+                        help="write results to this file (default: stdout)")
+    parser.add_argument("--cwbench", default=None,
+                        help="path to cwbench, to include micro-benchmarks")
+    parser.add_argument("-n", type=int, dest="micro_reps", default=5,
+                        help="passes over the corpus in each micro-benchmark "
+                        "(default: 5)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "RESULTS"),
+                        help="compare two results files and exit")
+    parser.add_argument("corpus", nargs="?")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            results = json.load(f)
+        compare(baseline, results)
+        return
+    if args.corpus is None:
+        parser.error("a corpus directory is required")
+
+    info = corpus_info(args.corpus, args.year)
+    if not info["files"]:
+        parser.error("no event files for %s in %s" % (args.year, args.corpus))
+
+    results = {"label": args.label,
+               "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "host": platform.node(),
+               "platform": platform.platform(),
+               "corpus": info,
+               "tools": run_tools(args.bindir, args.corpus, info,
+                                  args.repeats, args.tools),
+               "micro": None}
+    if args.cwbench:
+        results["micro"] = run_micro(args.cwbench, args.corpus, info,
+                                     args.micro_reps)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
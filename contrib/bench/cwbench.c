@@ -0,0 +1,340 @@
+/*
+ * This file is part of Chadwick
+ * Copyright (c) 2002-2023, Dr T L Turocy (ted.turocy@gmail.com)
+ *                          Chadwick Baseball Bureau (http://www.chadwick-bureau.com)
+ *
+ * FILE: contrib/bench/cwbench.c
+ * Micro-benchmarks of the core Chadwick library routines
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to the Free Software
+ * Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+ */
+
+/*
+ * All event files named on the command line are read into memory
+ * before any timing begins, so that the figures reported measure
+ * only the library routines, and not file input.  Results are written
+ * to standard output as JSON; see bench.py for a driver which combines
+ * them with end-to-end timings of the tools.
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#include "cwlib/chadwick.h"
+
+char year[5] = "";
+int repetitions = 1;
+
+/* All the games and events in the corpus, in file order */
+typedef struct cwbench_corpus_struct {
+  CWLeague *league;
+  CWScorebook *scorebook;
+  int num_games, num_events;
+  CWGame **games;
+  CWEvent **events;
+  /* The roster of the batting team for each event, or NULL if none */
+  CWRoster **rosters;
+} CWBenchCorpus;
+
+void
+cwbench_print_help(void)
+{
+  fprintf(stderr, "\n\ncwbench times the core Chadwick library routines on a set of\n");
+  fprintf(stderr, "event files, and writes the results as JSON to standard output.\n");
+  fprintf(stderr, "The team and roster files for the season must be in the current directory.\n");
+  fprintf(stderr, "Usage: cwbench [options] eventfile...\n");
+  fprintf(stderr, "options:\n");
+  fprintf(stderr, "  -h        print this help\n");
+  fprintf(stderr, "  -y year   season of the event files (required)\n");
+  fprintf(stderr, "  -n reps   number of passes over the corpus in each benchmark (default 1)\n\n");
+
+  exit(0);
+}
+
+void
+cwbench_read_league(CWLeague *league)
+{
+  char filename[256];
+  FILE *file;
+  CWRoster *roster;
+
+  sprintf(filename, "TEAM%s", year);
+  if ((file = fopen(filename, "r")) == NULL) {
+    fprintf(stderr, "Can't find teamfile (%s)\n", filename);
+    exit(1);
+  }
+  cw_league_read(league, file);
+  fclose(file);
+
+  for (roster = league->first_roster; roster; roster = roster->next) {
+    sprintf(filename, "%s%s.ROS", roster->team_id, year);
+    if ((file = fopen(filename, "r")) != NULL) {
+      cw_roster_read(roster, file);
+      fclose(file);
+    }
+  }
+}
+
+void
+cwbench_read_corpus(CWBenchCorpus *corpus, int num_files, char **filenames)
+{
+  CWGame *game;
+  CWEvent *event;
+  int i, e;
+
+  corpus->league = cw_league_create();
+  cwbench_read_league(corpus->league);
+
+  corpus->scorebook = cw_scorebook_create();
+  for (i = 0; i < num_files; i++) {
+    FILE *file = fopen(filenames[i], "r");
+    if (file == NULL) {
+      fprintf(stderr, "Warning: could not open file '%s'\n", filenames[i]);
+      continue;
+    }
+    cw_scorebook_read(corpus->scorebook, file);
+    fclose(file);
+  }
+
+  corpus->num_games = corpus->num_events = 0;
+  for (game = corpus->scorebook->first_game; game; game = game->next) {
+    corpus->num_games++;
+    for (event = game->first_event; event; event = event->next) {
+      corpus->num_events++;
+    }
+  }
+
+  corpus->games = (CWGame **) malloc(sizeof(CWGame *) *
+				     (corpus->num_games + 1));
+  corpus->events = (CWEvent **) malloc(sizeof(CWEvent *) *
+				       (corpus->num_events + 1));
+  corpus->rosters = (CWRoster **) malloc(sizeof(CWRoster *) *
+					 (corpus->num_events + 1));
+
+  for (game = corpus->scorebook->first_game, i = 0, e = 0;
+       game; game = game->next, i++) {
+    CWRoster *visitors =
+      cw_league_roster_find(corpus->league,
+			    cw_game_info_lookup(game, "visteam"));
+    CWRoster *home =
+      cw_league_roster_find(corpus->league,
+			    cw_game_info_lookup(game, "hometeam"));
+
+    corpus->games[i] = game;
+    for (event = game->first_event; event; event = event->next, e++) {
+      corpus->events[e] = event;
+      corpus->rosters[e] = (event->batting_team == 0) ? visitors : home;
+    }
+  }
+}
+
+void
+cwbench_cleanup_corpus(CWBenchCorpus *corpus)
+{
+  free(corpus->games);
+  free(corpus->events);
+  free(corpus->rosters);
+  cw_scorebook_cleanup(corpus->scorebook);
+  free(corpus->scorebook);
+  cw_league_cleanup(corpus->league);
+  free(corpus->league);
+}
+
+/*
+ * Each benchmark returns the number of operations timed, and stores
+ * the elapsed processor time in seconds in 'seconds'.
+ */
+
+long
+cwbench_parse_event(CWBenchCorpus *corpus, double *seconds)
+{
+  CWEventData data;
+  clock_t start;
+  long count = 0;
+  int r, i;
+
+  start = clock();
+  for (r = 0; r < repetitions; r++) {
+    for (i = 0; i < corpus->num_events; i++) {
+      cw_parse_event(corpus->events[i]->event_text, &data);
+      count++;
+    }
+  }
+  *seconds = (double) (clock() - start) / CLOCKS_PER_SEC;
+  return count;
+}
+
+long
+cwbench_gameiter_next(CWBenchCorpus *corpus, double *seconds)
+{
+  CWGameIterator **iters;
+  clock_t start;
+  long count = 0;
+  int r, i;
+
+  /* Iterators are allocated outside the timed loop, and reset each pass */
+  iters = (CWGameIterator **) malloc(sizeof(CWGameIterator *) *
+				     (corpus->num_games + 1));
+  for (i = 0; i < corpus->num_games; i++) {
+    iters[i] = cw_gameiter_create(corpus->games[i]);
+  }
+
+  start = clock();
+  for (r = 0; r < repetitions; r++) {
+    for (i = 0; i < corpus->num_games; i++) {
+      CWGameIterator *gameiter = iters[i];
+      if (r > 0) {
+	cw_gameiter_reset(gameiter);
+      }
+      while (gameiter->event != NULL) {
+	cw_gameiter_next(gameiter);
+	count++;
+      }
+    }
+  }
+  *seconds = (double) (clock() - start) / CLOCKS_PER_SEC;
+
+  for (i = 0; i < corpus->num_games; i++) {
+    cw_gameiter_cleanup(iters[i]);
+    free(iters[i]);
+  }
+  free(iters);
+  return count;
+}
+
+long
+cwbench_box_create(CWBenchCorpus *corpus, double *seconds)
+{
+  clock_t start;
+  long count = 0;
+  int r, i;
+
+  start = clock();
+  for (r = 0; r < repetitions; r++) {
+    for (i = 0; i < corpus->num_games; i++) {
+      CWBoxscore *boxscore = cw_box_create(corpus->games[i]);
+      cw_box_cleanup(boxscore);
+      free(boxscore);
+      count++;
+    }
+  }
+  *seconds = (double) (clock() - start) / CLOCKS_PER_SEC;
+  return count;
+}
+
+long
+cwbench_roster_player_find(CWBenchCorpus *corpus, double *seconds)
+{
+  clock_t start;
+  long count = 0, found = 0;
+  int r, i;
+
+  start = clock();
+  for (r = 0; r < repetitions; r++) {
+    for (i = 0; i < corpus->num_events; i++) {
+      if (corpus->rosters[i] != NULL &&
+	  cw_roster_player_find(corpus->rosters[i],
+				corpus->events[i]->batter) != NULL) {
+	found++;
+      }
+      count++;
+    }
+  }
+  *seconds = (double) (clock() - start) / CLOCKS_PER_SEC;
+
+  if (found < count) {
+    fprintf(stderr, "Warning: %ld of %ld batters not found on rosters\n",
+	    count - found, count);
+  }
+  return count;
+}
+
+typedef struct cwbench_struct {
+  char *name;
+  long (*f)(CWBenchCorpus *, double *);
+} cwbench_struct;
+
+static cwbench_struct benchmarks[] = {
+  { "cw_parse_event", cwbench_parse_event },
+  { "cw_gameiter_next", cwbench_gameiter_next },
+  { "cw_box_create", cwbench_box_create },
+  { "cw_roster_player_find", cwbench_roster_player_find },
+  { NULL, NULL }
+};
+
+int
+main(int argc, char *argv[])
+{
+  CWBenchCorpus corpus;
+  int i;
+
+  for (i = 1; i < argc; i++) {
+    if (!strcmp(argv[i], "-h")) {
+      cwbench_print_help();
+    }
+    else if (!strcmp(argv[i], "-y")) {
+      if (++i < argc) {
+	strncpy(year, argv[i], 4);
+	year[4] = '\0';
+      }
+    }
+    else if (!strcmp(argv[i], "-n")) {
+      if (++i < argc) {
+	repetitions = atoi(argv[i]);
+      }
+    }
+    else if (argv[i][0] == '-') {
+      fprintf(stderr, "*** Invalid option '%s'.\n", argv[i]);
+      exit(1);
+    }
+    else {
+      break;
+    }
+  }
+
+  if (!strcmp(year, "")) {
+    fprintf(stderr, "*** A season must be specified with -y.\n");
+    exit(1);
+  }
+  if (repetitions < 1) {
+    repetitions = 1;
+  }
+
+  cwbench_read_corpus(&corpus, argc - i, argv + i);
+
+  printf("{\n");
+  printf("  \"year\": \"%s\",\n", year);
+  printf("  \"repetitions\": %d,\n", repetitions);
+  printf("  \"games\": %d,\n", corpus.num_games);
+  printf("  \"events\": %d,\n", corpus.num_events);
+  printf("  \"benchmarks\": [\n");
+  for (i = 0; benchmarks[i].name != NULL; i++) {
+    double seconds;
+    long count = (*benchmarks[i].f)(&corpus, &seconds);
+
+    printf("    { \"name\": \"%s\", \"operations\": %ld, "
+	   "\"seconds\": %.6f, \"ns_per_op\": %.2f }%s\n",
+	   benchmarks[i].name, count, seconds,
+	   (count > 0) ? seconds * 1.0e9 / count : 0.0,
+	   (benchmarks[i + 1].name != NULL) ? "," : "");
+  }
+  printf("  ]\n");
+  printf("}\n");
+
+  cwbench_cleanup_corpus(&corpus);
+  return 0;
+}
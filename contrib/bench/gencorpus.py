@@ -0,0 +1,409 @@
+"""
+Generate a synthetic Retrosheet corpus for benchmarking the Chadwick tools.
+
+The corpus consists of a TEAMyyyy file, a roster file for each team, and
+one event file per home team (yyyyTTT.EVA or yyyyTTT.EVN), in the same
+layout as the Retrosheet downloads, so that the tools can be run on it
+exactly as they would be on real data.  Games are simulated plate
+appearance by plate appearance, so scores, base states, pitching lines
+and substitutions are all consistent.
+
+Usage:
+
+  python gencorpus.py [-y year] [-g games] [-p pitches] [-s subs]
+                      [--seed n] outdir
+
+  -g  number of games to generate (default 2430)
+  -p  average length of the pitch sequence in each plate appearance;
+      0 generates files without pitch data, as for older seasons
+  -s  average number of substitutions (pinch-hitters and pitching
+      changes) made by each team in each game
+
+The same arguments and seed always generate the same corpus.
+"""
+
+import datetime
+import os
+import random
+import sys
+
+TEAMS = [("BAL", "A", "Baltimore", "Orioles"),
+         ("BOS", "A", "Boston", "Red Sox"),
+         ("NYA", "A", "New York", "Yankees"),
+         ("TOR", "A", "Toronto", "Blue Jays"),
+         ("CHN", "N", "Chicago", "Cubs"),
+         ("CIN", "N", "Cincinnati", "Reds"),
+         ("PIT", "N", "Pittsburgh", "Pirates"),
+         ("SLN", "N", "St. Louis", "Cardinals")]
+
+# Each roster has eight regulars (catcher through right field, in order),
+# five starting pitchers, seven relievers, and five bench players.
+NUM_REGULARS, NUM_STARTERS, NUM_RELIEVERS, NUM_BENCH = 8, 5, 7, 5
+ROSTER_POSITIONS = ["C", "1B", "2B", "3B", "SS", "OF", "OF", "OF"]
+
+# Plate appearance outcomes, with relative frequencies.
+OUTCOMES = [("K", 20), ("GO", 20), ("FO", 16), ("S", 15), ("D", 5),
+            ("T", 1), ("HR", 3), ("W", 8), ("HP", 1), ("E", 2), ("GDP", 3)]
+
+
+def player_id(team, number):
+    return "%sx%03d" % (team.lower(), number)
+
+
+class Team(object):
+    def __init__(self, team_id, league, city, nickname):
+        self.team_id = team_id
+        self.league = league
+        self.city = city
+        self.nickname = nickname
+        self.players = [player_id(team_id, i)
+                        for i in range(NUM_REGULARS + NUM_STARTERS +
+                                       NUM_RELIEVERS + NUM_BENCH)]
+        self.regulars = self.players[:NUM_REGULARS]
+        i = NUM_REGULARS
+        self.starters = self.players[i:i + NUM_STARTERS]
+        i += NUM_STARTERS
+        self.relievers = self.players[i:i + NUM_RELIEVERS]
+        self.bench = self.players[i + NUM_RELIEVERS:]
+        self.games_played = 0
+
+    def write_roster(self, f, rnd):
+        for (i, pid) in enumerate(self.players):
+            if i < NUM_REGULARS:
+                pos = ROSTER_POSITIONS[i]
+            elif i < NUM_REGULARS + NUM_STARTERS + NUM_RELIEVERS:
+                pos = "P"
+            else:
+                pos = rnd.choice(ROSTER_POSITIONS)
+            f.write("%s,Last%d,First%d,%s,%s,%s,%s\n" %
+                    (pid, i, i, rnd.choice("RRLB"), rnd.choice("RRL"),
+                     self.team_id, pos))
+
+
+class Side(object):
+    """The state of one team during a game."""
+    def __init__(self, team, rnd):
+        self.team = team
+        order = list(range(NUM_REGULARS))
+        rnd.shuffle(order)
+        starter = team.starters[team.games_played % NUM_STARTERS]
+        # Lineup entries are [player, fielding position]; the pitcher bats ninth
+        self.lineup = [[team.regulars[i], i + 2] for i in order]
+        self.lineup.append([starter, 1])
+        self.relievers = list(team.relievers)
+        self.bench = list(team.bench)
+        rnd.shuffle(self.relievers)
+        rnd.shuffle(self.bench)
+        self.pitchers = [starter]
+        self.runs_allowed = {starter: 0}
+        self.pending = []      # lineup slots needing a defensive replacement
+        self.next_batter = 0
+
+    @property
+    def pitcher(self):
+        return self.pitchers[-1]
+
+    def pitcher_slot(self):
+        for (slot, (pid, pos)) in enumerate(self.lineup):
+            if pos == 1:
+                return slot
+        return None
+
+
+class GameSimulator(object):
+    def __init__(self, rnd, pitches, subs):
+        self.rnd = rnd
+        self.pitches = pitches
+        # Probability of each kind of substitution per plate appearance,
+        # for about 38 plate appearances by each team in a game
+        self.sub_prob = subs / 76.0
+        self.outcomes = [o for (o, w) in OUTCOMES for _ in range(w)]
+
+    def pitch_sequence(self, outcome):
+        """Returns (count, pitches) for a plate appearance ending in 'outcome'."""
+        if self.pitches <= 0:
+            return ("??", "")
+        rnd = self.rnd
+        target = rnd.randint(0, 2 * self.pitches - 2)
+        balls = strikes = 0
+        seq = []
+        while len(seq) < target:
+            c = rnd.choice("BBCSFF")
+            if c == "B" and balls < 3:
+                balls += 1
+            elif c in "CS" and strikes < 2:
+                strikes += 1
+            elif c == "F":
+                strikes = min(strikes + 1, 2)
+            else:
+                continue
+            seq.append(c)
+        if outcome == "K":
+            while strikes < 2:
+                seq.append("C")
+                strikes += 1
+            last = "S"
+        elif outcome == "W":
+            while balls < 3:
+                seq.append("B")
+                balls += 1
+            last = "B"
+        elif outcome == "HP":
+            last = "H"
+        else:
+            last = "X"
+        return ("%d%d" % (balls, strikes), "".join(seq) + last)
+
+    def substitute(self, out, side, slot, pid, pos):
+        out.write('sub,%s,"%s",%d,%d,%d\n' % (pid, pid, side, slot + 1, pos))
+
+    def change_pitcher(self, out, sides, side, pid):
+        fielding = sides[side]
+        slot = fielding.pitcher_slot()
+        fielding.lineup[slot][0] = pid
+        fielding.pitchers.append(pid)
+        fielding.runs_allowed[pid] = 0
+        self.substitute(out, side, slot, pid, 1)
+
+    def take_field(self, out, sides, side):
+        """Replace any players who were pinch-hit for in the last half-inning."""
+        fielding = sides[side]
+        for slot in fielding.pending:
+            pos = fielding.lineup[slot][1]
+            if pos == 1:
+                if fielding.relievers:
+                    self.change_pitcher(out, sides, side,
+                                        fielding.relievers.pop())
+                    continue
+                # Out of pitchers: the pinch-hitter stays in to pitch
+                fielding.pitchers.append(fielding.lineup[slot][0])
+                fielding.runs_allowed[fielding.lineup[slot][0]] = 0
+            elif fielding.bench and self.rnd.random() < 0.5:
+                fielding.lineup[slot][0] = fielding.bench.pop()
+            self.substitute(out, side, slot, fielding.lineup[slot][0], pos)
+        fielding.pending = []
+
+    def play(self, out, inning, side, batter, count, pitches, text):
+        out.write("play,%d,%d,%s,%s,%s,%s\n" %
+                  (inning, side, batter, count, pitches, text))
+
+    def half_inning(self, out, sides, inning, side, score):
+        rnd = self.rnd
+        batting, fielding = sides[side], sides[1 - side]
+        self.take_field(out, sides, 1 - side)
+        outs = 0
+        bases = [None, None, None]
+
+        def score_run():
+            score[side] += 1
+            fielding.runs_allowed[fielding.pitcher] += 1
+
+        while outs < 3:
+            if side == 1 and inning >= 9 and score[1] > score[0]:
+                return
+            # Substitutions are attached to the preceding play, so none
+            # can be made before the first pitch of the game
+            first_pitch = inning == 1 and side == 0 and batting.next_batter == 0
+            if not first_pitch and fielding.relievers and \
+               rnd.random() < self.sub_prob:
+                self.change_pitcher(out, sides, 1 - side,
+                                    fielding.relievers.pop())
+
+            slot = batting.next_batter
+            batting.next_batter = (slot + 1) % 9
+            if not first_pitch and batting.bench and \
+               rnd.random() < self.sub_prob:
+                batting.lineup[slot][0] = batting.bench.pop()
+                batting.pending.append(slot)
+                self.substitute(out, side, slot, batting.lineup[slot][0], 11)
+            batter = batting.lineup[slot][0]
+
+            if bases[0] and not bases[1] and outs < 2 and rnd.random() < 0.05:
+                # A stolen base, before the plate appearance is completed
+                self.play(out, inning, side, batter, "??", "", "SB2")
+                bases = [None, bases[0], bases[2]]
+
+            outcome = rnd.choice(self.outcomes)
+            if outcome == "GDP" and (not bases[0] or outs == 2):
+                outcome = "GO"
+            (count, pitches) = self.pitch_sequence(outcome)
+            adv = []
+
+            if outcome == "K":
+                text = "K"
+                outs += 1
+            elif outcome == "GO":
+                text = rnd.choice(["63/G", "43/G", "53/G", "3/G", "13/G"])
+                outs += 1
+            elif outcome == "FO":
+                text = rnd.choice(["7/F", "8/F", "9/F", "6/P", "4/L", "2/FL"])
+                outs += 1
+            elif outcome == "GDP":
+                text = rnd.choice(["64(1)3/GDP", "6(1)3/GDP", "46(1)3/GDP"])
+                outs += 2
+                if bases[2] and outs < 3:
+                    adv.append("3-H")
+                    score_run()
+                if bases[1] and outs < 3:
+                    adv.append("2-3")
+                bases = [None, None, bases[1] if outs < 3 else None]
+            elif outcome in ("S", "E"):
+                text = ("S%s/G" % rnd.choice("6789")) if outcome == "S" else \
+                       ("E%s/G" % rnd.choice("3456"))
+                if bases[2]:
+                    adv.append("3-H")
+                    score_run()
+                if bases[1]:
+                    adv.append("2-H")
+                    score_run()
+                if bases[0]:
+                    adv.append("1-2")
+                bases = [batter, bases[0], None]
+            elif outcome == "D":
+                text = "D%s/L" % rnd.choice("789")
+                for (i, a) in ((2, "3-H"), (1, "2-H")):
+                    if bases[i]:
+                        adv.append(a)
+                        score_run()
+                if bases[0]:
+                    adv.append("1-3")
+                bases = [None, batter, bases[0]]
+            elif outcome in ("T", "HR"):
+                text = "T9/L" if outcome == "T" else "HR/F%s" % rnd.choice("789")
+                for (i, a) in ((2, "3-H"), (1, "2-H"), (0, "1-H")):
+                    if bases[i]:
+                        adv.append(a)
+                        score_run()
+                if outcome == "HR":
+                    score_run()
+                    bases = [None, None, None]
+                else:
+                    bases = [None, None, batter]
+            else:
+                # Walk or hit batsman: only forced runners advance
+                text = outcome
+                if bases[0]:
+                    if bases[1]:
+                        if bases[2]:
+                            adv.append("3-H")
+                            score_run()
+                        adv.append("2-3")
+                        bases[2] = bases[1]
+                    adv.append("1-2")
+                    bases[1] = bases[0]
+                bases[0] = batter
+
+            if adv:
+                text += "." + ";".join(adv)
+            self.play(out, inning, side, batter, count, pitches, text)
+
+    def game(self, out, game_id, date, visitor, home):
+        rnd = self.rnd
+        sides = [Side(visitor, rnd), Side(home, rnd)]
+        out.write("id,%s\nversion,2\n" % game_id)
+        for (key, value) in [("visteam", visitor.team_id),
+                             ("hometeam", home.team_id),
+                             ("site", home.team_id + "01"),
+                             ("date", date.strftime("%Y/%m/%d")),
+                             ("number", "0"),
+                             ("starttime", "7:05PM"),
+                             ("daynight", "night"),
+                             ("usedh", "false"),
+                             ("umphome", "umpx001"),
+                             ("howscored", "park"),
+                             ("pitches", "pitches" if self.pitches > 0 else "none"),
+                             ("temp", str(rnd.randint(50, 90))),
+                             ("attendance", str(rnd.randint(10000, 45000)))]:
+            out.write("info,%s,%s\n" % (key, value))
+        for (side, s) in enumerate(sides):
+            for (slot, (pid, pos)) in enumerate(s.lineup):
+                out.write('start,%s,"%s",%d,%d,%d\n' % (pid, pid, side,
+                                                        slot + 1, pos))
+
+        score = [0, 0]
+        inning = 1
+        while True:
+            self.half_inning(out, sides, inning, 0, score)
+            if inning >= 9 and score[1] > score[0]:
+                break
+            self.half_inning(out, sides, inning, 1, score)
+            if inning >= 9 and score[0] != score[1]:
+                break
+            inning += 1
+
+        for s in sides:
+            for pid in s.pitchers:
+                out.write("data,er,%s,%d\n" % (pid, s.runs_allowed[pid]))
+        visitor.games_played += 1
+        home.games_played += 1
+
+
+def generate(outdir, year=2023, games=2430, pitches=4, subs=4, seed=1):
+    """
+    Write a corpus of 'games' games for season 'year' to 'outdir'.
+    Returns the list of event files written.
+    """
+    rnd = random.Random(seed)
+    teams = [Team(*t) for t in TEAMS]
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+
+    with open(os.path.join(outdir, "TEAM%d" % year), "w") as f:
+        for t in teams:
+            f.write("%s,%s,%s,%s\n" % (t.team_id, t.league, t.city, t.nickname))
+    for t in teams:
+        with open(os.path.join(outdir, "%s%d.ROS" % (t.team_id, year)), "w") as f:
+            t.write_roster(f, rnd)
+
+    files = {}
+    for t in teams:
+        files[t.team_id] = os.path.join(outdir, "%d%s.EV%s" %
+                                        (year, t.team_id, t.league))
+    streams = dict((k, open(v, "w")) for (k, v) in files.items())
+    try:
+        simulator = GameSimulator(rnd, pitches, subs)
+        date = datetime.date(year, 4, 1)
+        played = 0
+        while played < games:
+            # Each day, every team plays once; doubleheaders are not generated
+            order = list(teams)
+            rnd.shuffle(order)
+            for i in range(0, len(order), 2):
+                if played == games:
+                    break
+                (visitor, home) = (order[i], order[i + 1])
+                game_id = "%s%s0" % (home.team_id, date.strftime("%Y%m%d"))
+                simulator.game(streams[home.team_id], game_id, date,
+                               visitor, home)
+                played += 1
+            date += datetime.timedelta(days=1)
+    finally:
+        for f in streams.values():
+            f.close()
+    return sorted(files.values())
+
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate a synthetic "
+                                     "Retrosheet corpus for benchmarking.")
+    parser.add_argument("-y", type=int, default=2023, dest="year",
+                        help="season of the generated corpus (default: 2023)")
+    parser.add_argument("-g", type=int, default=2430, dest="games",
+                        help="number of games (default: 2430)")
+    parser.add_argument("-p", type=int, default=4, dest="pitches",
+                        help="average pitches per plate appearance; "
+                        "0 for no pitch data (default: 4)")
+    parser.add_argument("-s", type=float, default=4, dest="subs",
+                        help="average substitutions per team per game "
+                        "(default: 4)")
+    parser.add_argument("--seed", type=int, default=1,
+                        help="random seed (default: 1)")
+    parser.add_argument("outdir")
+    args = parser.parse_args(argv)
+    generate(args.outdir, args.year, args.games, args.pitches, args.subs,
+             args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
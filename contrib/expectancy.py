@@ -0,0 +1,298 @@
+"""
+Run expectancy and win expectancy tables from cwevent output.
+
+The input is cwevent output, with a header row, containing at least
+the following fields:
+
+  cwevent -q -n -y 2023 -f 0,2-4,8-9,40 -x 13,45,55 2023*.EV? > 2023.csv
+
+Events are read in batches of complete games, and the situation before
+each event is encoded as a single integer, so that each table is
+accumulated with numpy.bincount.  Tables hold sums and counts rather
+than averages, so tables built separately (for example, one per season)
+can be merged exactly.
+
+Usage:
+
+  python expectancy.py [-j processes] [-w wetable.csv] 1950.csv 1951.csv ...
+
+Each input file is processed in its own worker process.  With -s, the
+sums and counts are saved to an .npz file, which later runs can merge
+with -l, so that new seasons can be added without reprocessing old ones.
+"""
+
+import csv
+import multiprocessing
+import sys
+
+import numpy as np
+
+FIELDS = ["GAME_ID", "INN_CT", "BAT_HOME_ID", "OUTS_CT",
+          "AWAY_SCORE_CT", "HOME_SCORE_CT", "EVENT_OUTS_CT",
+          "START_BASES_CD", "EVENT_RUNS_CT", "FATE_RUNS_CT"]
+
+
+class EventBatch(object):
+    """
+    A batch of events from complete games, as integer arrays.
+    'home_win' is 1 if the home team won the game in which the event
+    occurred, 0 if it lost, and -1 if the game ended tied.
+    'complete_half' is true if the half-inning in which the event
+    occurred ended with three outs.
+    """
+    def __init__(self, columns):
+        self.inning = np.asarray(columns["INN_CT"], dtype=np.int64)
+        self.bat_home = np.asarray(columns["BAT_HOME_ID"], dtype=np.int64)
+        self.outs = np.asarray(columns["OUTS_CT"], dtype=np.int64)
+        self.away_score = np.asarray(columns["AWAY_SCORE_CT"], dtype=np.int64)
+        self.home_score = np.asarray(columns["HOME_SCORE_CT"], dtype=np.int64)
+        self.event_outs = np.asarray(columns["EVENT_OUTS_CT"], dtype=np.int64)
+        self.bases = np.asarray(columns["START_BASES_CD"], dtype=np.int64)
+        self.event_runs = np.asarray(columns["EVENT_RUNS_CT"], dtype=np.int64)
+        self.fate_runs = np.asarray(columns["FATE_RUNS_CT"], dtype=np.int64)
+        self.home_win = self._home_win(columns["GAME_ID"])
+        self.complete_half = self._complete_half(columns["GAME_ID"])
+
+    def __len__(self):
+        return len(self.outs)
+
+    def _home_win(self, game_ids):
+        """Determine the outcome of each game from its last event."""
+        game_ids = np.asarray(game_ids)
+        n = len(game_ids)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        is_last = np.ones(n, dtype=bool)
+        is_last[:-1] = game_ids[1:] != game_ids[:-1]
+        last = np.flatnonzero(is_last)
+        game = np.concatenate(([0], np.cumsum(is_last)[:-1]))
+
+        home = self.home_score[last] + self.event_runs[last] * self.bat_home[last]
+        away = self.away_score[last] + self.event_runs[last] * (1 - self.bat_home[last])
+        outcome = np.where(home > away, 1, np.where(home < away, 0, -1))
+        return outcome[game]
+
+    def _complete_half(self, game_ids):
+        """Determine from its last event whether each half-inning ended
+        with three outs."""
+        game_ids = np.asarray(game_ids)
+        n = len(game_ids)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        is_last = np.ones(n, dtype=bool)
+        is_last[:-1] = ((game_ids[1:] != game_ids[:-1]) |
+                        (self.inning[1:] != self.inning[:-1]) |
+                        (self.bat_home[1:] != self.bat_home[:-1]))
+        last = np.flatnonzero(is_last)
+        half = np.concatenate(([0], np.cumsum(is_last)[:-1]))
+        return (self.outs[last] + self.event_outs[last] >= 3)[half]
+
+
+def read_batches(stream, batch_size=100000):
+    """
+    Read cwevent output from 'stream', yielding EventBatch objects of
+    roughly 'batch_size' events.  Batches always end at a game boundary.
+    """
+    reader = csv.reader(stream)
+    header = next(reader)
+    try:
+        index = [header.index(field) for field in FIELDS]
+    except ValueError:
+        missing = [field for field in FIELDS if field not in header]
+        raise ValueError("cwevent output lacks fields: %s" % ", ".join(missing))
+
+    columns = dict((field, []) for field in FIELDS)
+    game_ids = columns["GAME_ID"]
+    for row in reader:
+        if len(game_ids) >= batch_size and row[index[0]] != game_ids[-1]:
+            yield EventBatch(columns)
+            columns = dict((field, []) for field in FIELDS)
+            game_ids = columns["GAME_ID"]
+        for (field, i) in zip(FIELDS, index):
+            columns[field].append(row[i])
+    if game_ids:
+        yield EventBatch(columns)
+
+
+class ExpectancyTable(object):
+    """
+    Base class for tables of sums and counts over integer-coded states.
+    Subclasses list the names of their arrays in 'arrays'.
+    """
+    arrays = ()
+
+    def merge(self, other):
+        for name in self.arrays:
+            getattr(self, name)[:] += getattr(other, name)
+        return self
+
+
+class RunExpectancy(ExpectancyTable):
+    """
+    Expected runs from the start of an event to the end of the half-inning,
+    by base-out state.  States are numbered outs * 8 + bases, where bases
+    is coded as in cwevent START_BASES_CD.
+
+    Half-innings which end before three outs are made, such as walk-offs
+    or the last half-inning of a rain-shortened or suspended game, are
+    excluded.  Home half-innings from the ninth on are also excluded by
+    default, as the home team's play in these depends on the score.
+    """
+    num_states = 24
+    arrays = ("runs", "count")
+
+    def __init__(self, exclude_walkoffs=True):
+        self.exclude_walkoffs = exclude_walkoffs
+        self.runs = np.zeros(self.num_states, dtype=np.int64)
+        self.count = np.zeros(self.num_states, dtype=np.int64)
+
+    def add(self, batch):
+        keep = (batch.outs < 3) & batch.complete_half
+        if self.exclude_walkoffs:
+            keep &= ~((batch.inning >= 9) & (batch.bat_home == 1))
+        state = (batch.outs * 8 + batch.bases)[keep]
+        runs = (batch.event_runs + batch.fate_runs)[keep]
+        self.runs += np.bincount(state, weights=runs,
+                                 minlength=self.num_states).astype(np.int64)
+        self.count += np.bincount(state, minlength=self.num_states)
+
+    @property
+    def table(self):
+        """Expected runs as an array indexed by [outs, bases]."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.runs / self.count).reshape(3, 8)
+
+    def write(self, stream):
+        stream.write("BASES,OUTS_0,OUTS_1,OUTS_2\n")
+        table = self.table
+        for bases in range(8):
+            stream.write("%d,%s\n" % (bases,
+                                      ",".join("%.3f" % table[outs, bases]
+                                               for outs in range(3))))
+
+
+class WinExpectancy(ExpectancyTable):
+    """
+    Probability that the home team wins, by inning, half-inning, outs,
+    bases, and home team lead at the start of an event.  Extra innings
+    are pooled with the last inning, and leads are limited to
+    +/- 'max_lead'.  Games which ended tied are excluded.
+    """
+    arrays = ("wins", "count")
+
+    def __init__(self, max_inning=9, max_lead=10):
+        self.max_inning = max_inning
+        self.max_lead = max_lead
+        self.shape = (max_inning, 2, 3, 8, 2 * max_lead + 1)
+        size = int(np.prod(self.shape))
+        self.wins = np.zeros(size, dtype=np.int64)
+        self.count = np.zeros(size, dtype=np.int64)
+
+    def add(self, batch):
+        keep = (batch.home_win >= 0) & (batch.outs < 3)
+        inning = np.clip(batch.inning, 1, self.max_inning) - 1
+        lead = np.clip(batch.home_score - batch.away_score,
+                       -self.max_lead, self.max_lead) + self.max_lead
+        state = np.ravel_multi_index((inning, batch.bat_home, batch.outs,
+                                      batch.bases, lead), self.shape,
+                                     mode="clip")[keep]
+        self.wins += np.bincount(state, weights=batch.home_win[keep],
+                                 minlength=self.wins.size).astype(np.int64)
+        self.count += np.bincount(state, minlength=self.count.size)
+
+    @property
+    def table(self):
+        """Home win probability, indexed by [inning-1, half, outs, bases,
+        lead+max_lead]; NaN for situations which did not occur."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.wins / self.count).reshape(self.shape)
+
+    def write(self, stream):
+        stream.write("INN_CT,BAT_HOME_ID,OUTS_CT,START_BASES_CD,HOME_LEAD,"
+                     "EVENT_CT,HOME_WIN_PCT\n")
+        for state in np.flatnonzero(self.count):
+            (inning, half, outs, bases, lead) = np.unravel_index(state, self.shape)
+            stream.write("%d,%d,%d,%d,%d,%d,%.4f\n" %
+                         (inning + 1, half, outs, bases, lead - self.max_lead,
+                          self.count[state],
+                          float(self.wins[state]) / self.count[state]))
+
+
+def process_file(path):
+    """Compute the run and win expectancy tables for one file."""
+    run_exp, win_exp = RunExpectancy(), WinExpectancy()
+    with open(path) as f:
+        for batch in read_batches(f):
+            run_exp.add(batch)
+            win_exp.add(batch)
+    return run_exp, win_exp
+
+
+def process_files(paths, processes=None):
+    """Compute tables over all 'paths', one worker process per file."""
+    run_exp, win_exp = RunExpectancy(), WinExpectancy()
+    if processes == 1 or len(paths) <= 1:
+        for (r, w) in map(process_file, paths):
+            run_exp.merge(r)
+            win_exp.merge(w)
+        return run_exp, win_exp
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        for (r, w) in pool.imap_unordered(process_file, paths):
+            run_exp.merge(r)
+            win_exp.merge(w)
+    finally:
+        pool.close()
+        pool.join()
+    return run_exp, win_exp
+
+
+def save_tables(path, run_exp, win_exp):
+    """Save the sums and counts of both tables, for merging in a later run."""
+    np.savez_compressed(path, runs=run_exp.runs, re_count=run_exp.count,
+                        wins=win_exp.wins, we_count=win_exp.count)
+
+
+def load_tables(path):
+    """Load tables previously written by save_tables()."""
+    data = np.load(path)
+    run_exp, win_exp = RunExpectancy(), WinExpectancy()
+    run_exp.runs += data["runs"]
+    run_exp.count += data["re_count"]
+    win_exp.wins += data["wins"]
+    win_exp.count += data["we_count"]
+    return run_exp, win_exp
+
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Compute run expectancy and "
+                                     "win expectancy tables from cwevent output.")
+    parser.add_argument("-j", type=int, default=None, dest="processes",
+                        help="number of worker processes (default: one per CPU)")
+    parser.add_argument("-w", dest="we_file", default=None,
+                        help="write win expectancy table to this file")
+    parser.add_argument("-s", dest="save_file", default=None,
+                        help="save sums and counts to this .npz file")
+    parser.add_argument("-l", dest="load_files", action="append", default=[],
+                        help="merge sums and counts saved with -s (repeatable)")
+    parser.add_argument("files", nargs="*")
+    args = parser.parse_args(argv)
+
+    run_exp, win_exp = process_files(args.files, args.processes)
+    for path in args.load_files:
+        (r, w) = load_tables(path)
+        run_exp.merge(r)
+        win_exp.merge(w)
+    if args.save_file:
+        save_tables(args.save_file, run_exp, win_exp)
+
+    run_exp.write(sys.stdout)
+    if args.we_file:
+        with open(args.we_file, "w") as f:
+            win_exp.write(f)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,5 +1,8 @@
 import csv
+import gzip
+import hashlib
 import itertools
+import os
 import subprocess
 
 class ToolProcess(object):
@@ -8,12 +11,105 @@ class ToolProcess(object):
         self.tool_name = tool_name
         self.year = year
 
-    def __iter__(self):
+    def rows(self):
+        """Run the tool, yielding each row of output as a list of fields."""
         process = subprocess.Popen(self.command_line, shell=True,
                                    stdout=subprocess.PIPE)
-        for row in csv.DictReader(process.stdout, self.header):
-            yield self.rowclass(row)
-            
+        for row in csv.reader(process.stdout):
+            yield row
+        process.wait()
+
+    def __iter__(self):
+        for row in self.rows():
+            yield self.rowclass(dict(zip(self.header, row)))
+
+
+def iterate_games(rows):
+    """Group rows by game ID (always the first field), in order."""
+    for (game_id, game_rows) in itertools.groupby(rows, lambda row: row[0]):
+        yield game_id, list(game_rows)
+
+
+def game_digest(rows):
+    """
+    Digest of the field values of the rows for one game.  Rows are
+    compared after CSV parsing, so differences only in quoting or in
+    line endings do not change the digest.
+    """
+    digest = hashlib.sha1()
+    for row in rows:
+        digest.update("\x1f".join(row))
+        digest.update("\n")
+    return digest.hexdigest()
+
+
+class Snapshot(object):
+    """
+    The output of a reference tool for one year, recorded once so that
+    later regression runs need not run the reference tool again.
+
+    A snapshot is a gzip-compressed file.  It begins with a line
+      #snapshot,tool_name,year
+    followed by a line
+      #game,game_id,digest
+    for each game, and then by the rows themselves as CSV.  The digests
+    can therefore be read without decompressing the rest of the file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.tool_name = None
+        self.year = None
+
+    @staticmethod
+    def filename(tool_name, year):
+        return "%s%s.csv.gz" % (tool_name.lower(), year)
+
+    def record(self, process):
+        """Run 'process' and write its output as this snapshot."""
+        games = list(iterate_games(process.rows()))
+        f = gzip.open(self.path, "wb")
+        try:
+            f.write("#snapshot,%s,%s\n" % (process.tool_name, process.year))
+            for (game_id, rows) in games:
+                f.write("#game,%s,%s\n" % (game_id, game_digest(rows)))
+            writer = csv.writer(f, lineterminator="\n")
+            for (game_id, rows) in games:
+                writer.writerows(rows)
+        finally:
+            f.close()
+        self.tool_name, self.year = process.tool_name, process.year
+        return len(games)
+
+    def digests(self):
+        """Returns the list of (game_id, digest) pairs in the snapshot."""
+        digests = [ ]
+        f = gzip.open(self.path, "rb")
+        try:
+            for line in f:
+                if not line.startswith("#"):
+                    break
+                fields = line.rstrip("\r\n").split(",")
+                if fields[0] == "#snapshot":
+                    self.tool_name, self.year = fields[1], fields[2]
+                elif fields[0] == "#game":
+                    digests.append((fields[1], fields[2]))
+        finally:
+            f.close()
+        return digests
+
+    def rows(self, game_ids=None):
+        """
+        Yield the rows of the snapshot as lists of fields.  If 'game_ids'
+        is given, only rows for those games are yielded.
+        """
+        f = gzip.open(self.path, "rb")
+        try:
+            lines = itertools.dropwhile(lambda line: line.startswith("#"), f)
+            for row in csv.reader(lines):
+                if game_ids is None or row[0] in game_ids:
+                    yield row
+        finally:
+            f.close()
 
 
 class DiffEngine(object):
@@ -26,17 +122,159 @@ class DiffEngine(object):
                 diffs[key].append(self.diff_object(key, x, y))
         return diffs
 
+    def calculate_snapshot(self, process, snapshot):
+        """
+        Compare the output of 'process' to 'snapshot'.  Games whose
+        digests match are skipped; only the remaining games are compared
+        field by field, and only their reference rows are read from the
+        snapshot.  Returns the diffs, as calculate() does, together with
+        lists of the IDs of games which differ, and of games which are
+        present in only one of the two.
+        """
+        digests = snapshot.digests()
+        expected = dict(digests)
+        candidates = { }
+        extra = [ ]
+        seen = set()
+        for (game_id, rows) in iterate_games(process.rows()):
+            seen.add(game_id)
+            if game_id not in expected:
+                extra.append(game_id)
+            elif game_digest(rows) != expected[game_id]:
+                candidates[game_id] = rows
+        missing = [ game_id for (game_id, digest) in digests
+                    if game_id not in seen ]
 
-def run_diff(engine, tool1, tool2, data_dir):
-    import os
-    os.chdir(data_dir)
-    diffs = engine.calculate(tool1, tool2)
+        def make_rows(rows):
+            return [ process.rowclass(dict(zip(process.header, row)))
+                     for row in rows ]
+
+        # A digest mismatch may still be a difference that the row
+        # class tolerates, so a game only differs if some field does
+        diffs = { }
+        changed = [ ]
+        reference = dict(iterate_games(snapshot.rows(set(candidates))))
+        for game_id in sorted(candidates):
+            rows1 = candidates[game_id]
+            rows2 = reference.get(game_id, [ ])
+            game_diffs = self.calculate(make_rows(rows1), make_rows(rows2))
+            if game_diffs or len(rows1) != len(rows2):
+                changed.append(game_id)
+            for key in game_diffs:
+                diffs.setdefault(key, [ ]).extend(game_diffs[key])
+        return diffs, changed, extra + missing
 
+
+def print_diffs(diffs, name1, name2):
     for key in sorted(diffs.keys()):
-        print "%-55s %-10s %-10s" % (key, tool1.tool_name, tool2.tool_name)
+        print "%-55s %-10s %-10s" % (key, name1, name2)
         print "-"*77
 
         for d in diffs[key]:
             print "%-55s %-10s %-10s" % \
                   (d.context, d.tool1, d.tool2)
         print
+
+
+def run_diff(engine, tool1, tool2, data_dir):
+    os.chdir(data_dir)
+    diffs = engine.calculate(tool1, tool2)
+    print_diffs(diffs, tool1.tool_name, tool2.tool_name)
+
+
+def record_snapshot(process, snapshot_dir, data_dir):
+    """Record the output of 'process' in 'snapshot_dir'."""
+    snapshot_dir = os.path.abspath(snapshot_dir)
+    if not os.path.isdir(snapshot_dir):
+        os.makedirs(snapshot_dir)
+    path = os.path.join(snapshot_dir,
+                        Snapshot.filename(process.tool_name, process.year))
+    cwd = os.getcwd()
+    os.chdir(data_dir)
+    try:
+        count = Snapshot(path).record(process)
+    finally:
+        os.chdir(cwd)
+    print "%s: recorded %d games in %s" % (process.year, count, path)
+
+
+def run_snapshot_diff(engine, process, snapshot_path, data_dir):
+    """
+    Compare the output of 'process' to the snapshot at 'snapshot_path'.
+    Returns True if every game matches.
+    """
+    snapshot = Snapshot(os.path.abspath(snapshot_path))
+    cwd = os.getcwd()
+    os.chdir(data_dir)
+    try:
+        (diffs, changed, unmatched) = engine.calculate_snapshot(process,
+                                                                snapshot)
+    finally:
+        os.chdir(cwd)
+
+    print "%s: %d games differ from snapshot, %d unmatched" % \
+          (process.year, len(changed), len(unmatched))
+    for game_id in unmatched:
+        print "  %s appears in only one of %s and %s" % \
+              (game_id, process.tool_name, snapshot.tool_name)
+    print_diffs(diffs, process.tool_name, snapshot.tool_name)
+    return not changed and not unmatched
+
+
+def main(argv, process_class, engine_class, reference_name):
+    """
+    Command-line interface shared by eventdiff.py and gamediff.py:
+      chadwick reference year     compare Chadwick to the reference tool
+      --record reference year...  record snapshots of the reference tool
+      --snapshot chadwick year... compare Chadwick to recorded snapshots
+
+    With --snapshot, the exit status is 1 if any year requested has no
+    snapshot, or has games which differ from or are missing in its
+    snapshot, and 0 otherwise.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Compare Chadwick output to %s output." % reference_name,
+        usage="%(prog)s [options] chadwick reference year\n"
+        "       %(prog)s [options] --record reference year...\n"
+        "       %(prog)s [options] --snapshot chadwick year...")
+    parser.add_argument("-d", dest="data_dir",
+                        default="~/git/retrosheet/event/regular",
+                        help="directory containing the event files")
+    parser.add_argument("-s", dest="snapshot_dir", default="snapshots",
+                        help="directory in which snapshots are stored")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true",
+                      help="record snapshots of the reference tool's output")
+    mode.add_argument("--snapshot", action="store_true",
+                      help="compare Chadwick to recorded snapshots")
+    parser.add_argument("tool")
+    parser.add_argument("args", nargs="+", metavar="year")
+    args = parser.parse_args(argv)
+    data_dir = os.path.expanduser(args.data_dir)
+
+    if args.record:
+        for year in args.args:
+            record_snapshot(process_class(args.tool, reference_name, year),
+                            args.snapshot_dir, data_dir)
+        return 0
+    if args.snapshot:
+        ok = True
+        for year in args.args:
+            path = os.path.join(args.snapshot_dir,
+                                Snapshot.filename(reference_name, year))
+            if not os.path.exists(path):
+                print "%s: no snapshot %s" % (year, path)
+                ok = False
+                continue
+            ok &= run_snapshot_diff(engine_class(),
+                                    process_class(args.tool, "Chadwick", year),
+                                    path, data_dir)
+        return 0 if ok else 1
+
+    if len(args.args) != 2:
+        parser.error("expected: chadwick reference year")
+    (reference, year) = args.args
+    run_diff(engine_class(), process_class(args.tool, "Chadwick", year),
+             process_class(reference, reference_name, year), data_dir)
+    return 0
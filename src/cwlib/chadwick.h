@@ -32,6 +32,7 @@
 #include "parse.h"
 #include "gameiter.h"
 #include "box.h"
+#include "index.h"
 
 #endif   /* CW_CHADWICK_H */
 
@@ -0,0 +1,278 @@
+/*
+ * This file is part of Chadwick
+ * Copyright (c) 2002-2023, Dr T L Turocy (ted.turocy@gmail.com)
+ *                          Chadwick Baseball Bureau (http://www.chadwick-bureau.com)
+ *
+ * FILE: src/cwlib/index.c
+ * Implementation of player-game indexes
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to the Free Software
+ * Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "file.h"
+#include "parse.h"
+#include "gameiter.h"
+#include "index.h"
+
+/*
+ * Each record in an index file is a single line of the form
+ *   player,role,filename,offset,game_id,event;event;...
+ * where role is one of the characters in cw_index_role_codes.
+ */
+static char cw_index_role_codes[] = "BPFR";
+
+static char
+cw_index_role_code(int role)
+{
+  switch (role) {
+  case CW_INDEX_BATTER:
+    return cw_index_role_codes[0];
+  case CW_INDEX_PITCHER:
+    return cw_index_role_codes[1];
+  case CW_INDEX_FIELDER:
+    return cw_index_role_codes[2];
+  default:
+    return cw_index_role_codes[3];
+  }
+}
+
+static int
+cw_index_role_from_code(char code)
+{
+  char *p = strchr(cw_index_role_codes, code);
+  return (code != '\0' && p != NULL) ? (1 << (p - cw_index_role_codes)) : 0;
+}
+
+static char *
+cw_index_basename(char *filename)
+{
+  char *p = strrchr(filename, '/');
+  if (p == NULL) {
+    p = strrchr(filename, '\\');
+  }
+  return (p == NULL) ? filename : p + 1;
+}
+
+static char *
+cw_index_strdup(char *s)
+{
+  char *t = (char *) malloc(sizeof(char) * (strlen(s) + 1));
+  strcpy(t, s);
+  return t;
+}
+
+CWIndex *
+cw_index_create(void)
+{
+  CWIndex *index = (CWIndex *) malloc(sizeof(CWIndex));
+  index->first_entry = index->last_entry = NULL;
+  return index;
+}
+
+void
+cw_index_cleanup(CWIndex *index)
+{
+  CWIndexEntry *entry = index->first_entry;
+
+  while (entry != NULL) {
+    CWIndexEntry *next_entry = entry->next;
+    free(entry->player_id);
+    free(entry->filename);
+    free(entry->game_id);
+    free(entry->events);
+    free(entry);
+    entry = next_entry;
+  }
+  index->first_entry = index->last_entry = NULL;
+}
+
+static CWIndexEntry *
+cw_index_entry_append(CWIndex *index, char *player_id, int role,
+		      char *filename, long offset, char *game_id)
+{
+  CWIndexEntry *entry = (CWIndexEntry *) malloc(sizeof(CWIndexEntry));
+  entry->player_id = cw_index_strdup(player_id);
+  entry->filename = cw_index_strdup(filename);
+  entry->game_id = cw_index_strdup(game_id);
+  entry->role = role;
+  entry->offset = offset;
+  entry->num_events = 0;
+  entry->events = NULL;
+  entry->next = NULL;
+
+  if (index->first_entry == NULL) {
+    index->first_entry = entry;
+  }
+  else {
+    index->last_entry->next = entry;
+  }
+  index->last_entry = entry;
+  return entry;
+}
+
+static void
+cw_index_entry_add_event(CWIndexEntry *entry, int event)
+{
+  if (entry->num_events > 0 &&
+      entry->events[entry->num_events - 1] == event) {
+    /* Record each event at most once for a given player and role */
+    return;
+  }
+  if ((entry->num_events & 15) == 0) {
+    entry->events = (int *) realloc(entry->events,
+				    sizeof(int) * (entry->num_events + 16));
+  }
+  entry->events[entry->num_events++] = event;
+}
+
+/*
+ * Record an appearance of 'player_id' in 'role' in the game being indexed.
+ * The games indexed here are small enough that a linear search over
+ * the entries for the game is adequate.
+ */
+static void
+cw_index_add_appearance(CWIndex *index, char *player_id, int role,
+			CWGame *game, int event)
+{
+  CWIndexEntry *entry;
+
+  if (player_id == NULL || !strcmp(player_id, "")) {
+    return;
+  }
+
+  for (entry = index->first_entry; entry; entry = entry->next) {
+    if (entry->role == role && !strcmp(entry->player_id, player_id)) {
+      break;
+    }
+  }
+  if (entry == NULL) {
+    entry = cw_index_entry_append(index, player_id, role, "",
+				  0, game->game_id);
+  }
+  cw_index_entry_add_event(entry, event);
+}
+
+void
+cw_index_write_game(FILE *file, char *filename, long offset, CWGame *game)
+{
+  CWIndex *index = cw_index_create();
+  CWGameIterator *gameiter = cw_gameiter_create(game);
+  CWIndexEntry *entry;
+  int i;
+
+  while (gameiter->event != NULL) {
+    if (strcmp(gameiter->event->event_text, "NP")) {
+      int event = gameiter->state->event_count + 1;
+      int defense = 1 - gameiter->state->batting_team;
+
+      cw_index_add_appearance(index, gameiter->event->batter,
+			      CW_INDEX_BATTER, game, event);
+      cw_index_add_appearance(index, gameiter->state->fielders[1][defense],
+			      CW_INDEX_PITCHER, game, event);
+      for (i = 2; i <= 9; i++) {
+	cw_index_add_appearance(index, gameiter->state->fielders[i][defense],
+				CW_INDEX_FIELDER, game, event);
+      }
+      for (i = 1; i <= 3; i++) {
+	cw_index_add_appearance(index, gameiter->state->runners[i].runner,
+				CW_INDEX_RUNNER, game, event);
+      }
+    }
+    cw_gameiter_next(gameiter);
+  }
+
+  for (entry = index->first_entry; entry; entry = entry->next) {
+    fprintf(file, "%s,%c,%s,%ld,%s,", entry->player_id,
+	    cw_index_role_code(entry->role), cw_index_basename(filename),
+	    offset, entry->game_id);
+    for (i = 0; i < entry->num_events; i++) {
+      fprintf(file, (i > 0) ? ";%d" : "%d", entry->events[i]);
+    }
+    fprintf(file, "\n");
+  }
+
+  cw_gameiter_cleanup(gameiter);
+  free(gameiter);
+  cw_index_cleanup(index);
+  free(index);
+}
+
+int
+cw_index_read(CWIndex *index, FILE *file, char *player_id, int roles)
+{
+  char buf[4096], *tok;
+  int count = 0;
+  size_t len = (player_id) ? strlen(player_id) : 0;
+
+  if (file == NULL) {
+    return -1;
+  }
+
+  while (fgets(buf, 4096, file) != NULL) {
+    char *player, *filename, *game_id, *events;
+    int role;
+    long offset;
+    CWIndexEntry *entry;
+
+    /* Almost all records are rejected here, before tokenizing */
+    if (player_id && (strncmp(buf, player_id, len) || buf[len] != ',')) {
+      continue;
+    }
+
+    player = cw_strtok(buf);
+    tok = cw_strtok(NULL);
+    role = (tok) ? cw_index_role_from_code(tok[0]) : 0;
+    filename = cw_strtok(NULL);
+    tok = cw_strtok(NULL);
+    offset = (tok) ? strtol(tok, NULL, 10) : -1;
+    game_id = cw_strtok(NULL);
+    events = cw_strtok(NULL);
+
+    if (!player || !filename || !game_id || offset < 0 || !(role & roles)) {
+      continue;
+    }
+
+    entry = cw_index_entry_append(index, player, role,
+				  filename, offset, game_id);
+    for (tok = events; tok && *tok != '\0'; ) {
+      char *end;
+      long event = strtol(tok, &end, 10);
+      if (end == tok) {
+	break;
+      }
+      cw_index_entry_add_event(entry, (int) event);
+      tok = (*end == ';') ? end + 1 : end;
+    }
+    count++;
+  }
+
+  return count;
+}
+
+CWIndexEntry *
+cw_index_file_next(CWIndex *index, CWIndexEntry *entry, char *filename)
+{
+  char *name = cw_index_basename(filename);
+
+  entry = (entry) ? entry->next : index->first_entry;
+  while (entry != NULL && strcmp(entry->filename, name)) {
+    entry = entry->next;
+  }
+  return entry;
+}
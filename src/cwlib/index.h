@@ -0,0 +1,94 @@
+/*
+ * This file is part of Chadwick
+ * Copyright (c) 2002-2023, Dr T L Turocy (ted.turocy@gmail.com)
+ *                          Chadwick Baseball Bureau (http://www.chadwick-bureau.com)
+ *
+ * FILE: src/cwlib/index.h
+ * Interface to module for building and reading player-game indexes
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to the Free Software
+ * Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+ */
+
+#ifndef CW_INDEX_H
+#define CW_INDEX_H
+
+#include "game.h"
+
+/*
+ * Roles in which a player can appear in an event.  These are bit flags,
+ * so that queries may ask for several roles at once.
+ */
+#define CW_INDEX_BATTER   1
+#define CW_INDEX_PITCHER  2
+#define CW_INDEX_FIELDER  4
+#define CW_INDEX_RUNNER   8
+#define CW_INDEX_ALL      15
+
+/*
+ * An index entry records that a player appeared in a given role in
+ * a game, together with the event numbers (as reported in cwevent
+ * field 96, EVENT_ID) on which the player did so.  'offset' is the position
+ * of the game's 'id' record in the event file, suitable for fseek().
+ */
+typedef struct cw_index_entry_struct {
+  char *player_id, *filename, *game_id;
+  int role;
+  long offset;
+  int num_events, *events;
+  struct cw_index_entry_struct *next;
+} CWIndexEntry;
+
+typedef struct cw_index_struct {
+  CWIndexEntry *first_entry, *last_entry;
+} CWIndex;
+
+/*
+ * Allocates and initializes a new, empty CWIndex.
+ * Caller is responsible for memory management of the created pointer
+ */
+CWIndex *cw_index_create(void);
+
+/*
+ * Cleans up internal memory associated with 'index'.
+ * Caller is responsible for free()ing the 'index' pointer.
+ */
+void cw_index_cleanup(CWIndex *index);
+
+/*
+ * Writes the index records for 'game', which begins at 'offset' in
+ * event file 'filename', to the stream 'file'.  One record is written
+ * for each distinct player and role appearing in the game.
+ */
+void cw_index_write_game(FILE *file, char *filename, long offset,
+			 CWGame *game);
+
+/*
+ * Reads the index stored in the stream 'file', keeping only those
+ * records for 'player_id' in any of the roles in the bitmask 'roles'.
+ * If 'player_id' is NULL, records for all players are kept.
+ * Returns the number of records kept, or -1 on failure.
+ */
+int cw_index_read(CWIndex *index, FILE *file, char *player_id, int roles);
+
+/*
+ * Returns the first entry after 'entry' (or the first entry in the
+ * index, if 'entry' is NULL) which refers to the event file 'filename',
+ * or NULL if there is no such entry.  Filenames are compared without
+ * any leading directory components.
+ */
+CWIndexEntry *cw_index_file_next(CWIndex *index, CWIndexEntry *entry,
+				 char *filename);
+
+#endif  /* CW_INDEX_H */
@@ -60,6 +60,22 @@ char program_name[20] = "cwdaily";
 
 int print_header = 0;
 
+/* Keys for totals (--group-by), in the order they are output */
+#define CWDAILY_NUM_KEYS 6
+
+char *key_names[CWDAILY_NUM_KEYS] = {
+  "season", "team", "player", "home", "opponent", "park"
+};
+
+char *key_headers[CWDAILY_NUM_KEYS] = {
+  "SEASON", "TEAM_ID", "PLAYER_ID", "HOME_FL", "OPPONENT_ID", "PARK_ID"
+};
+
+/* Keys to group by; if none are set, one row per player-game is output */
+int group_keys[CWDAILY_NUM_KEYS] = { 0, 0, 0, 0, 0, 0 };
+
+int aggregate = 0;
+
 
 /* Auxiliary function: negative numbers in the boxscore structure
  * correspond to nulls, which should be rendered as blanks in output.
@@ -81,12 +97,21 @@ typedef int (*field_func)(char *, CWGameIterator *, CWBoxscore *,
 			  int, int, int,
 			  CWBoxPlayer *, CWRoster *, CWRoster *);
 
+/*
+ * typedef for functions computing the value of a statistical field.
+ * Negative values are nulls.  Statistical fields are computed rather
+ * than printed directly so that they can also be totalled (--group-by).
+ */
+typedef int (*stat_func)(CWGameIterator *, CWBoxscore *, int, CWBoxPlayer *);
+
 /*
  * convenient structure to hold all information relating to a field
- * together in one place
+ * together in one place.  Exactly one of 'f' and 's' is non-NULL;
+ * fields with an 's' function are the statistical fields.
  */
 typedef struct field_struct {
   field_func f;
+  stat_func s;
   char *header, *description;
 } field_struct;
 
@@ -100,6 +125,10 @@ int funcname(char *buffer, CWGameIterator *gameiter, \
              int team, int slot, int seq, CWBoxPlayer *player, \
              CWRoster *visitors, CWRoster *home)
 
+#define DECLARE_STATFUNC(funcname) \
+int funcname(CWGameIterator *gameiter, CWBoxscore *box, \
+             int team, CWBoxPlayer *player)
+
 /* Field 0 */
 DECLARE_FIELDFUNC(cwdaily_game_id)
 {
@@ -194,9 +223,9 @@ DECLARE_FIELDFUNC(cwdaily_site)
 
 
 #define DECLARE_BATTING_CATEGORY(funcname, cat) \
-DECLARE_FIELDFUNC(funcname) \
+DECLARE_STATFUNC(funcname) \
 { \
-  return cwdaily_print_integer_or_null(buffer, player->batting->cat); \
+  return player->batting->cat; \
 }
 
 DECLARE_BATTING_CATEGORY(cwdaily_B_G, g)
@@ -205,13 +234,12 @@ DECLARE_BATTING_CATEGORY(cwdaily_B_AB, ab)
 DECLARE_BATTING_CATEGORY(cwdaily_B_R, r)
 DECLARE_BATTING_CATEGORY(cwdaily_B_H, h)
 
-DECLARE_FIELDFUNC(cwdaily_B_TB)
+DECLARE_STATFUNC(cwdaily_B_TB)
 {
-  return cwdaily_print_integer_or_null(buffer,
-				       player->batting->h +
-				       player->batting->b2 +
-				       2*player->batting->b3 +
-				       3*player->batting->hr);
+  return (player->batting->h +
+	  player->batting->b2 +
+	  2*player->batting->b3 +
+	  3*player->batting->hr);
 }
 	       
 
@@ -232,42 +260,35 @@ DECLARE_BATTING_CATEGORY(cwdaily_B_SB, sb)
 DECLARE_BATTING_CATEGORY(cwdaily_B_CS, cs)
 DECLARE_BATTING_CATEGORY(cwdaily_B_XI, xi)
 
-DECLARE_FIELDFUNC(cwdaily_B_G_DH)
+DECLARE_STATFUNC(cwdaily_B_G_DH)
 {
   int i;
   
   for (i = 0; i < player->num_positions; i++) {
     if (player->positions[i] == 10) {
-      return sprintf(buffer, "1");
+      return 1;
     }
   }
-  return sprintf(buffer, "0");
+  return 0;
 }
 
-DECLARE_FIELDFUNC(cwdaily_B_G_PH)
+DECLARE_STATFUNC(cwdaily_B_G_PH)
 {
-  if (player->ph_inn > 0) {
-    return sprintf(buffer, "1");
-  }
-  return sprintf(buffer, "0");
+  return (player->ph_inn > 0) ? 1 : 0;
 }
 
-DECLARE_FIELDFUNC(cwdaily_B_G_PR)
+DECLARE_STATFUNC(cwdaily_B_G_PR)
 {
-  if (player->pr_inn > 0) {
-    return sprintf(buffer, "1");
-  }
-  return sprintf(buffer, "0");
+  return (player->pr_inn > 0) ? 1 : 0;
 }
 
-DECLARE_FIELDFUNC(cwdaily_P_G)
+DECLARE_STATFUNC(cwdaily_P_G)
 {
-  return sprintf(buffer, "%d",
-		 (player->fielding[1] != NULL) ? 1 : 0);
+  return (player->fielding[1] != NULL) ? 1 : 0;
 }
 
 #define DECLARE_PITCHING_CATEGORY(funcname, cat) \
-DECLARE_FIELDFUNC(funcname) \
+DECLARE_STATFUNC(funcname) \
 { \
   int stat = 0; \
   CWBoxPitcher *pitcher = box->pitchers[team]; \
@@ -285,7 +306,7 @@ DECLARE_FIELDFUNC(funcname) \
       pitcher = pitcher->prev; \
     } \
   } \
-  return cwdaily_print_integer_or_null(buffer, stat); \
+  return stat; \
 }
 
 DECLARE_PITCHING_CATEGORY(cwdaily_P_GS, gs)
@@ -302,7 +323,7 @@ DECLARE_PITCHING_CATEGORY(cwdaily_P_R, r)
 DECLARE_PITCHING_CATEGORY(cwdaily_P_ER, er)
 DECLARE_PITCHING_CATEGORY(cwdaily_P_H, h)
 
-DECLARE_FIELDFUNC(cwdaily_P_TB)
+DECLARE_STATFUNC(cwdaily_P_TB)
 { 
   int stat = 0;
   CWBoxPitcher *pitcher = box->pitchers[team]; 
@@ -324,7 +345,7 @@ DECLARE_FIELDFUNC(cwdaily_P_TB)
       pitcher = pitcher->prev; 
     } 
   } 
-  return cwdaily_print_integer_or_null(buffer, stat); 
+  return stat; 
 }
 
 
@@ -347,7 +368,7 @@ DECLARE_PITCHING_CATEGORY(cwdaily_P_IRS, inrs)
 DECLARE_PITCHING_CATEGORY(cwdaily_P_GO, gb)
 DECLARE_PITCHING_CATEGORY(cwdaily_P_AO, fb)
 
-DECLARE_FIELDFUNC(cwdaily_P_PITCH)
+DECLARE_STATFUNC(cwdaily_P_PITCH)
 {
   int stat = 0;
   char *pitches = cw_game_info_lookup(gameiter->game, "pitches");
@@ -372,10 +393,10 @@ DECLARE_FIELDFUNC(cwdaily_P_PITCH)
   else {
     stat = -1;
   }
-  return cwdaily_print_integer_or_null(buffer, stat);
+  return stat;
 }
 
-DECLARE_FIELDFUNC(cwdaily_P_STRIKE)
+DECLARE_STATFUNC(cwdaily_P_STRIKE)
 {
   int stat = 0;
   char *pitches = cw_game_info_lookup(gameiter->game, "pitches");
@@ -400,45 +421,44 @@ DECLARE_FIELDFUNC(cwdaily_P_STRIKE)
   else {
     stat = -1;
   }
-  return cwdaily_print_integer_or_null(buffer, stat);
+  return stat;
 }
 
 
 #define DECLARE_FIELDING_CATEGORY(funcname, pos, cat) \
-DECLARE_FIELDFUNC(funcname) \
+DECLARE_STATFUNC(funcname) \
 { \
   if (player->fielding[pos] != NULL) { \
-    return cwdaily_print_integer_or_null(buffer, player->fielding[pos]->cat); \
+    return player->fielding[pos]->cat; \
   } \
   else { \
-    return sprintf(buffer, "0"); \
+    return 0; \
   } \
 }
 
 #define DECLARE_FIELDING_STARTER(funcname, pos) \
-DECLARE_FIELDFUNC(funcname) \
+DECLARE_STATFUNC(funcname) \
 { \
-  return sprintf(buffer, "%d", (player->start_position==pos) ? 1 : 0); \
+  return (player->start_position==pos) ? 1 : 0; \
 }
 
 #define DECLARE_FIELDING_TC(funcname, pos) \
-DECLARE_FIELDFUNC(funcname) \
+DECLARE_STATFUNC(funcname) \
 { \
   if (player->fielding[pos] != NULL) { \
     if ((player->fielding[pos]->po < 0) || \
 	(player->fielding[pos]->a < 0) || \
 	(player->fielding[pos]->e < 0)) { \
-      return cwdaily_print_integer_or_null(buffer, -1); \
+      return -1; \
     } \
     else { \
-      return cwdaily_print_integer_or_null(buffer, \
-					   player->fielding[pos]->po + \
-					   player->fielding[pos]->a + \
-					   player->fielding[pos]->e); \
+      return (player->fielding[pos]->po + \
+	      player->fielding[pos]->a + \
+	      player->fielding[pos]->e); \
     } \
   } \
   else { \
-    return sprintf(buffer, "0"); \
+    return 0; \
   } \
 }
 
@@ -533,163 +553,527 @@ DECLARE_FIELDING_CATEGORY(cwdaily_F_RF_DP, 9, dp)
 DECLARE_FIELDING_CATEGORY(cwdaily_F_RF_TP, 9, tp)
 
 static field_struct field_data[] = {
-  /*  0 */ { cwdaily_game_id, "GAME_ID", "game id" },
-  /*  1 */ { cwdaily_date, "GAME_DT", "date" },
-  /*  2 */ { cwdaily_number, "GAME_CT", "game number (0 = no double header)" },
-  /*  3 */ { cwdaily_app_date, "APPEAR_DT", "apperance date" },
-  { cwdaily_team_id, "TEAM_ID", "team id" },
-  { cwdaily_player_id, "PLAYER_ID", "player id" },
-  { cwdaily_player_slot, "SLOT_CT", "player slot in batting order" },
-  { cwdaily_player_seq, "SEQ_CT", "sequence in batting order slot" },
-  { cwdaily_home_fl, "HOME_FL", "home flag" },
-  { cwdaily_opponent_id, "OPPONENT_ID", "opponent id" },
-  { cwdaily_site, "PARK_ID", "park id" },
-  { cwdaily_B_G, "B_G", "B_G:   games played" },
-  { cwdaily_B_PA, "B_PA", "B_PA:  plate appearances" },
-  { cwdaily_B_AB, "B_AB", "B_AB:  at bats" },
-  { cwdaily_B_R, "B_R", "B_R:   runs" },
-  { cwdaily_B_H, "B_H", "B_H:   hits" },
-  { cwdaily_B_TB, "B_TB", "B_TB:  total bases" },
-  { cwdaily_B_2B, "B_2B", "B_2B:  doubles" },
-  { cwdaily_B_3B, "B_3B", "B_3B:  triples" },
-  { cwdaily_B_HR, "B_HR", "B_HR:  home runs" },
-  { cwdaily_B_HR4, "B_HR4", "B_HR4: grand slams" },
-  { cwdaily_B_RBI, "B_RBI", "B_RBI: runs batted in" },
-  { cwdaily_B_GW, "B_GW", "B_GW:  game winning RBI" },
-  { cwdaily_B_BB, "B_BB", "B_BB:  walks" },
-  { cwdaily_B_IBB, "B_IBB", "B_IBB: intentional walks" },
-  { cwdaily_B_SO, "B_SO", "B_SO:  strikeouts" },
-  { cwdaily_B_GDP, "B_GDP", "B_GDP: grounded into DP" },
-  { cwdaily_B_HP, "B_HP", "B_HP:  hit by pitch" },
-  { cwdaily_B_SH, "B_SH", "B_SH:  sacrifice hits" },
-  { cwdaily_B_SF, "B_SF", "B_SF:  sacrifice flies" },
-  { cwdaily_B_SB, "B_SB", "B_SB:  stolen bases" },
-  { cwdaily_B_CS, "B_CS", "B_CS:  caught stealing" },
-  { cwdaily_B_XI, "B_XI", "B_XI:  reached on interference" },
-  { cwdaily_B_G_DH, "B_G_DH", "B_G_DH: games as DH" },
-  { cwdaily_B_G_PH, "B_G_PH", "B_G_PH: games as PH" },
-  { cwdaily_B_G_PR, "B_G_PR", "B_G_PR: games as PR" },
-  { cwdaily_P_G, "P_G", "P_G:   games pitched" },
-  { cwdaily_P_GS, "P_GS", "P_GS:  games started" },
-  { cwdaily_P_CG, "P_CG", "P_CG:  complete games" },
-  { cwdaily_P_SHO, "P_SHO", "P_SHO: shutouts" },
-  { cwdaily_P_GF, "P_GF", "P_GF:  games finished" },
-  { cwdaily_P_W, "P_W", "P_W:  wins" },
-  { cwdaily_P_L, "P_L", "P_L:  losses" },
-  { cwdaily_P_SV, "P_SV", "P_SV:  saves" },
-  { cwdaily_P_OUT, "P_OUT", "P_OUT: outs recorded (innings pitched times 3)" },
-  { cwdaily_P_TBF, "P_TBF", "P_TBF: batters faced" },
-  { cwdaily_P_AB, "P_AB", "P_AB:  at bats" },
-  { cwdaily_P_R, "P_R", "P_R:   runs allowed" },
-  { cwdaily_P_ER, "P_ER", "P_ER:  earned runs allowed" },
-  { cwdaily_P_H, "P_H", "P_H:   hits allowed" },
-  { cwdaily_P_TB, "P_TB", "P_TB:  total bases allowed" },
-  { cwdaily_P_2B, "P_2B", "P_2B:  doubles allowed" },
-  { cwdaily_P_3B, "P_3B", "P_3B:  triples allowed" },
-  { cwdaily_P_HR, "P_HR", "P_HR:  home runs allowed" },
-  { cwdaily_P_HR4, "P_HR4", "P_HR4:  grand slams allowed" },
-  { cwdaily_P_BB, "P_BB", "P_BB:  walks allowed" },
-  { cwdaily_P_IBB, "P_IBB", "P_IBB: intentional walks allowed" },
-  { cwdaily_P_SO, "P_SO", "P_SO:  strikeouts" },
-  { cwdaily_P_GDP, "P_GDP", "P_GDP: grounded into double play" },
-  { cwdaily_P_HP, "P_HP", "P_HP:  hit batsmen" },
-  { cwdaily_P_SH, "P_SH", "P_SH:  sacrifice hits against" },
-  { cwdaily_P_SF, "P_SF", "P_SF:  sacrifice flies against" },
-  { cwdaily_P_XI, "P_XI", "P_XI:  reached on interference" },
-  { cwdaily_P_WP, "P_WP", "P_WP:  wild pitches" },
-  { cwdaily_P_BK, "P_BK", "P_BK:  balks" },
-  { cwdaily_P_IR, "P_IR", "P_IR:  inherited runners" },
-  { cwdaily_P_IRS, "P_IRS", "P_IRS: inherited runners scored" },
-  { cwdaily_P_GO, "P_GO", "P_GO:  ground outs" },
-  { cwdaily_P_AO, "P_AO", "P_AO:  air outs" },
-  { cwdaily_P_PITCH, "P_PITCH", "P_PITCH:  pitches" },
-  { cwdaily_P_STRIKE, "P_STRIKE", "P_STRIKE: strikes" },
-  { cwdaily_P_G, "F_P_G", "F_P_G:    games at P" },
-  { cwdaily_P_GS, "F_P_GS", "F_P_GS:   games started at P" },
-  { cwdaily_F_P_OUT, "F_P_OUT", "F_P_OUT:  outs recorded at P (innings fielded times 3)" },
-  { cwdaily_F_P_TC, "F_P_TC", "F_P_TC:   total chances at P" },
-  { cwdaily_F_P_PO, "F_P_PO", "F_P_PO:   putouts at P" },
-  { cwdaily_F_P_A, "F_P_A", "F_P_A:    assists at P" },
-  { cwdaily_F_P_E, "F_P_E", "F_P_E:    errors at P" },
-  { cwdaily_F_P_DP, "F_P_DP", "F_P_DP:   double plays at P" },
-  { cwdaily_F_P_TP, "F_P_TP", "F_P_TP:   triple plays at P" },
-  { cwdaily_F_C_G, "F_C_G", "F_C_G:    games at C" },
-  { cwdaily_F_C_GS, "F_C_GS", "F_C_GS:   games started at C" },
-  { cwdaily_F_C_OUT, "F_C_OUT", "F_C_OUT:  outs recorded at C (innings fielded times 3)" },
-  { cwdaily_F_C_TC, "F_C_TC", "F_C_TC:   total chances at C" },
-  { cwdaily_F_C_PO, "F_C_PO", "F_C_PO:   putouts at C" },
-  { cwdaily_F_C_A, "F_C_A", "F_C_A:    assists at C" },
-  { cwdaily_F_C_E, "F_C_E", "F_C_E:    errors at C" },
-  { cwdaily_F_C_DP, "F_C_DP", "F_C_DP:   double plays at C" },
-  { cwdaily_F_C_TP, "F_C_TP", "F_C_TP:   triple plays at C" },
-  { cwdaily_F_C_PB, "F_C_PB", "F_C_PB:   passed balls at C" },
-  { cwdaily_F_C_XI, "F_C_XI", "F_C_IX:   catcher's interference at C" },
-  { cwdaily_F_1B_G, "F_1B_G", "F_1B_G:   games at 1B" },
-  { cwdaily_F_1B_GS, "F_1B_GS", "F_1B_GS:  games started at 1B" },
-  { cwdaily_F_1B_OUT, "F_1B_OUT", "F_1B_OUT: outs recorded at 1B (innings fielded times 3)" },
-  { cwdaily_F_1B_TC, "F_1B_TC", "F_1B_TC:  total chances at 1B" },
-  { cwdaily_F_1B_PO, "F_1B_PO", "F_1B_PO:  putouts at 1B" },
-  { cwdaily_F_1B_A, "F_1B_A", "F_1B_A:   assists at 1B" },
-  { cwdaily_F_1B_E, "F_1B_E", "F_1B_E:   errors at 1B" },
-  { cwdaily_F_1B_DP, "F_1B_DP", "F_1B_DP:  double plays at 1B" },
-  { cwdaily_F_1B_TP, "F_1B_TP", "F_1B_TP:  triple plays at 1B" },
-  { cwdaily_F_2B_G, "F_2B_G", "F_2B_G:   games at 2B" },
-  { cwdaily_F_2B_GS, "F_2B_GS", "F_2B_GS:  games started at 2B" },
-  { cwdaily_F_2B_OUT, "F_2B_OUT", "F_2B_OUT: outs recorded at 2B (innings fielded times 3)" },
-  { cwdaily_F_2B_TC, "F_2B_TC", "F_2B_TC:  total chances at 2B" },
-  { cwdaily_F_2B_PO, "F_2B_PO", "F_2B_PO:  putouts at 2B" },
-  { cwdaily_F_2B_A, "F_2B_A", "F_2B_A:   assists at 2B" },
-  { cwdaily_F_2B_E, "F_2B_E", "F_2B_E:   errors at 2B" },
-  { cwdaily_F_2B_DP, "F_2B_DP", "F_2B_DP:  double plays at 2B" },
-  { cwdaily_F_2B_TP, "F_2B_TP", "F_2B_TP:  triple plays at 2B" },
-  { cwdaily_F_3B_G, "F_3B_G", "F_3B_G:   games at 3B" },
-  { cwdaily_F_3B_GS, "F_3B_GS", "F_3B_GS:  games started at 3B" },
-  { cwdaily_F_3B_OUT, "F_3B_OUT", "F_3B_OUT: outs recorded at 3B (innings fielded times 3)" },
-  { cwdaily_F_3B_TC, "F_3B_TC", "F_3B_TC:  total chances at 3B" },
-  { cwdaily_F_3B_PO, "F_3B_PO", "F_3B_PO:  putouts at 3B" },
-  { cwdaily_F_3B_A, "F_3B_A", "F_3B_A:   assists at 3B" },
-  { cwdaily_F_3B_E, "F_3B_E", "F_3B_E:   errors at 3B" },
-  { cwdaily_F_3B_DP, "F_3B_DP", "F_3B_DP:  double plays at 3B" },
-  { cwdaily_F_3B_TP, "F_3B_TP", "F_3B_TP:  triple plays at 3B" },
-  { cwdaily_F_SS_G, "F_SS_G", "F_SS_G:    games at SS" },
-  { cwdaily_F_SS_GS, "F_SS_GS", "F_SS_GS:  games started at SS" },
-  { cwdaily_F_SS_OUT, "F_SS_OUT", "F_SS_OUT: outs recorded at SS (innings fielded times 3)" },
-  { cwdaily_F_SS_TC, "F_SS_TC", "F_SS_TC:  total chances at SS" },
-  { cwdaily_F_SS_PO, "F_SS_PO", "F_SS_PO:  putouts at SS" },
-  { cwdaily_F_SS_A, "F_SS_A", "F_SS_A:   assists at SS" },
-  { cwdaily_F_SS_E, "F_SS_E", "F_SS_E:   errors at SS" },
-  { cwdaily_F_SS_DP, "F_SS_DP", "F_SS_DP:  double plays at SS" },
-  { cwdaily_F_SS_TP, "F_SS_TP", "F_SS_TP:  triple plays at SS" },
-  { cwdaily_F_LF_G, "F_LF_G", "F_LF_G:   games at LF" },
-  { cwdaily_F_LF_GS, "F_LF_GS", "F_LF_GS:  games started at LF" },
-  { cwdaily_F_LF_OUT, "F_LF_OUT", "F_LF_OUT: outs recorded at LF (innings fielded times 3)" },
-  { cwdaily_F_LF_TC, "F_LF_TC", "F_LF_TC:  total chances at LF" },
-  { cwdaily_F_LF_PO, "F_LF_PO", "F_LF_PO:  putouts at LF" },
-  { cwdaily_F_LF_A, "F_LF_A", "F_LF_A:   assists at LF" },
-  { cwdaily_F_LF_E, "F_LF_E", "F_LF_E:   errors at LF" },
-  { cwdaily_F_LF_DP, "F_LF_DP", "F_LF_DP:  double plays at LF" },
-  { cwdaily_F_LF_TP, "F_LF_TP", "F_LF_TP:  triple plays at LF" },
-  { cwdaily_F_CF_G, "F_CF_G", "F_CF_G:   games at CF" },
-  { cwdaily_F_CF_GS, "F_CF_GS", "F_CF_GS:  games started at CF" },
-  { cwdaily_F_CF_OUT, "F_CF_OUT", "F_CF_OUT: outs recorded at CF (innings fielded times 3)" },
-  { cwdaily_F_CF_TC, "F_CF_TC", "F_CF_TC:  total chances at CF" },
-  { cwdaily_F_CF_PO, "F_CF_PO", "F_CF_PO:  putouts at CF" },
-  { cwdaily_F_CF_A, "F_CF_A", "F_CF_A:   assists at CF" },
-  { cwdaily_F_CF_E, "F_CF_E", "F_CF_E:   errors at CF" },
-  { cwdaily_F_CF_DP, "F_CF_DP", "F_CF_DP:  double plays at CF" },
-  { cwdaily_F_CF_TP, "F_CF_TP", "F_CF_TP:  triple plays at CF" },
-  { cwdaily_F_RF_G, "F_RF_G", "F_RF_G:   games at RF" },
-  { cwdaily_F_RF_GS, "F_RF_GS", "F_RF_GS:  games started at RF" },
-  { cwdaily_F_RF_OUT, "F_RF_OUT", "F_RF_OUT: outs recorded at RF (innings fielded times 3)" },
-  { cwdaily_F_RF_TC, "F_RF_TC", "F_RF_TC:  total chances at RF" },
-  { cwdaily_F_RF_PO, "F_RF_PO", "F_RF_PO:  putouts at RF" },
-  { cwdaily_F_RF_A, "F_RF_A", "F_RF_A:   assists at RF" },
-  { cwdaily_F_RF_E, "F_RF_E", "F_RF_E:   errors at RF" },
-  { cwdaily_F_RF_DP, "F_RF_DP", "F_RF_DP:  double plays at RF" },
-  { cwdaily_F_RF_TP, "F_RF_TP", "F_RF_TP:  triple plays at RF" }
+  /*  0 */ { cwdaily_game_id, NULL, "GAME_ID", "game id" },
+  /*  1 */ { cwdaily_date, NULL, "GAME_DT", "date" },
+  /*  2 */ { cwdaily_number, NULL, "GAME_CT", "game number (0 = no double header)" },
+  /*  3 */ { cwdaily_app_date, NULL, "APPEAR_DT", "apperance date" },
+  { cwdaily_team_id, NULL, "TEAM_ID", "team id" },
+  { cwdaily_player_id, NULL, "PLAYER_ID", "player id" },
+  { cwdaily_player_slot, NULL, "SLOT_CT", "player slot in batting order" },
+  { cwdaily_player_seq, NULL, "SEQ_CT", "sequence in batting order slot" },
+  { cwdaily_home_fl, NULL, "HOME_FL", "home flag" },
+  { cwdaily_opponent_id, NULL, "OPPONENT_ID", "opponent id" },
+  { cwdaily_site, NULL, "PARK_ID", "park id" },
+  { NULL, cwdaily_B_G, "B_G", "B_G:   games played" },
+  { NULL, cwdaily_B_PA, "B_PA", "B_PA:  plate appearances" },
+  { NULL, cwdaily_B_AB, "B_AB", "B_AB:  at bats" },
+  { NULL, cwdaily_B_R, "B_R", "B_R:   runs" },
+  { NULL, cwdaily_B_H, "B_H", "B_H:   hits" },
+  { NULL, cwdaily_B_TB, "B_TB", "B_TB:  total bases" },
+  { NULL, cwdaily_B_2B, "B_2B", "B_2B:  doubles" },
+  { NULL, cwdaily_B_3B, "B_3B", "B_3B:  triples" },
+  { NULL, cwdaily_B_HR, "B_HR", "B_HR:  home runs" },
+  { NULL, cwdaily_B_HR4, "B_HR4", "B_HR4: grand slams" },
+  { NULL, cwdaily_B_RBI, "B_RBI", "B_RBI: runs batted in" },
+  { NULL, cwdaily_B_GW, "B_GW", "B_GW:  game winning RBI" },
+  { NULL, cwdaily_B_BB, "B_BB", "B_BB:  walks" },
+  { NULL, cwdaily_B_IBB, "B_IBB", "B_IBB: intentional walks" },
+  { NULL, cwdaily_B_SO, "B_SO", "B_SO:  strikeouts" },
+  { NULL, cwdaily_B_GDP, "B_GDP", "B_GDP: grounded into DP" },
+  { NULL, cwdaily_B_HP, "B_HP", "B_HP:  hit by pitch" },
+  { NULL, cwdaily_B_SH, "B_SH", "B_SH:  sacrifice hits" },
+  { NULL, cwdaily_B_SF, "B_SF", "B_SF:  sacrifice flies" },
+  { NULL, cwdaily_B_SB, "B_SB", "B_SB:  stolen bases" },
+  { NULL, cwdaily_B_CS, "B_CS", "B_CS:  caught stealing" },
+  { NULL, cwdaily_B_XI, "B_XI", "B_XI:  reached on interference" },
+  { NULL, cwdaily_B_G_DH, "B_G_DH", "B_G_DH: games as DH" },
+  { NULL, cwdaily_B_G_PH, "B_G_PH", "B_G_PH: games as PH" },
+  { NULL, cwdaily_B_G_PR, "B_G_PR", "B_G_PR: games as PR" },
+  { NULL, cwdaily_P_G, "P_G", "P_G:   games pitched" },
+  { NULL, cwdaily_P_GS, "P_GS", "P_GS:  games started" },
+  { NULL, cwdaily_P_CG, "P_CG", "P_CG:  complete games" },
+  { NULL, cwdaily_P_SHO, "P_SHO", "P_SHO: shutouts" },
+  { NULL, cwdaily_P_GF, "P_GF", "P_GF:  games finished" },
+  { NULL, cwdaily_P_W, "P_W", "P_W:  wins" },
+  { NULL, cwdaily_P_L, "P_L", "P_L:  losses" },
+  { NULL, cwdaily_P_SV, "P_SV", "P_SV:  saves" },
+  { NULL, cwdaily_P_OUT, "P_OUT", "P_OUT: outs recorded (innings pitched times 3)" },
+  { NULL, cwdaily_P_TBF, "P_TBF", "P_TBF: batters faced" },
+  { NULL, cwdaily_P_AB, "P_AB", "P_AB:  at bats" },
+  { NULL, cwdaily_P_R, "P_R", "P_R:   runs allowed" },
+  { NULL, cwdaily_P_ER, "P_ER", "P_ER:  earned runs allowed" },
+  { NULL, cwdaily_P_H, "P_H", "P_H:   hits allowed" },
+  { NULL, cwdaily_P_TB, "P_TB", "P_TB:  total bases allowed" },
+  { NULL, cwdaily_P_2B, "P_2B", "P_2B:  doubles allowed" },
+  { NULL, cwdaily_P_3B, "P_3B", "P_3B:  triples allowed" },
+  { NULL, cwdaily_P_HR, "P_HR", "P_HR:  home runs allowed" },
+  { NULL, cwdaily_P_HR4, "P_HR4", "P_HR4:  grand slams allowed" },
+  { NULL, cwdaily_P_BB, "P_BB", "P_BB:  walks allowed" },
+  { NULL, cwdaily_P_IBB, "P_IBB", "P_IBB: intentional walks allowed" },
+  { NULL, cwdaily_P_SO, "P_SO", "P_SO:  strikeouts" },
+  { NULL, cwdaily_P_GDP, "P_GDP", "P_GDP: grounded into double play" },
+  { NULL, cwdaily_P_HP, "P_HP", "P_HP:  hit batsmen" },
+  { NULL, cwdaily_P_SH, "P_SH", "P_SH:  sacrifice hits against" },
+  { NULL, cwdaily_P_SF, "P_SF", "P_SF:  sacrifice flies against" },
+  { NULL, cwdaily_P_XI, "P_XI", "P_XI:  reached on interference" },
+  { NULL, cwdaily_P_WP, "P_WP", "P_WP:  wild pitches" },
+  { NULL, cwdaily_P_BK, "P_BK", "P_BK:  balks" },
+  { NULL, cwdaily_P_IR, "P_IR", "P_IR:  inherited runners" },
+  { NULL, cwdaily_P_IRS, "P_IRS", "P_IRS: inherited runners scored" },
+  { NULL, cwdaily_P_GO, "P_GO", "P_GO:  ground outs" },
+  { NULL, cwdaily_P_AO, "P_AO", "P_AO:  air outs" },
+  { NULL, cwdaily_P_PITCH, "P_PITCH", "P_PITCH:  pitches" },
+  { NULL, cwdaily_P_STRIKE, "P_STRIKE", "P_STRIKE: strikes" },
+  { NULL, cwdaily_P_G, "F_P_G", "F_P_G:    games at P" },
+  { NULL, cwdaily_P_GS, "F_P_GS", "F_P_GS:   games started at P" },
+  { NULL, cwdaily_F_P_OUT, "F_P_OUT", "F_P_OUT:  outs recorded at P (innings fielded times 3)" },
+  { NULL, cwdaily_F_P_TC, "F_P_TC", "F_P_TC:   total chances at P" },
+  { NULL, cwdaily_F_P_PO, "F_P_PO", "F_P_PO:   putouts at P" },
+  { NULL, cwdaily_F_P_A, "F_P_A", "F_P_A:    assists at P" },
+  { NULL, cwdaily_F_P_E, "F_P_E", "F_P_E:    errors at P" },
+  { NULL, cwdaily_F_P_DP, "F_P_DP", "F_P_DP:   double plays at P" },
+  { NULL, cwdaily_F_P_TP, "F_P_TP", "F_P_TP:   triple plays at P" },
+  { NULL, cwdaily_F_C_G, "F_C_G", "F_C_G:    games at C" },
+  { NULL, cwdaily_F_C_GS, "F_C_GS", "F_C_GS:   games started at C" },
+  { NULL, cwdaily_F_C_OUT, "F_C_OUT", "F_C_OUT:  outs recorded at C (innings fielded times 3)" },
+  { NULL, cwdaily_F_C_TC, "F_C_TC", "F_C_TC:   total chances at C" },
+  { NULL, cwdaily_F_C_PO, "F_C_PO", "F_C_PO:   putouts at C" },
+  { NULL, cwdaily_F_C_A, "F_C_A", "F_C_A:    assists at C" },
+  { NULL, cwdaily_F_C_E, "F_C_E", "F_C_E:    errors at C" },
+  { NULL, cwdaily_F_C_DP, "F_C_DP", "F_C_DP:   double plays at C" },
+  { NULL, cwdaily_F_C_TP, "F_C_TP", "F_C_TP:   triple plays at C" },
+  { NULL, cwdaily_F_C_PB, "F_C_PB", "F_C_PB:   passed balls at C" },
+  { NULL, cwdaily_F_C_XI, "F_C_XI", "F_C_IX:   catcher's interference at C" },
+  { NULL, cwdaily_F_1B_G, "F_1B_G", "F_1B_G:   games at 1B" },
+  { NULL, cwdaily_F_1B_GS, "F_1B_GS", "F_1B_GS:  games started at 1B" },
+  { NULL, cwdaily_F_1B_OUT, "F_1B_OUT", "F_1B_OUT: outs recorded at 1B (innings fielded times 3)" },
+  { NULL, cwdaily_F_1B_TC, "F_1B_TC", "F_1B_TC:  total chances at 1B" },
+  { NULL, cwdaily_F_1B_PO, "F_1B_PO", "F_1B_PO:  putouts at 1B" },
+  { NULL, cwdaily_F_1B_A, "F_1B_A", "F_1B_A:   assists at 1B" },
+  { NULL, cwdaily_F_1B_E, "F_1B_E", "F_1B_E:   errors at 1B" },
+  { NULL, cwdaily_F_1B_DP, "F_1B_DP", "F_1B_DP:  double plays at 1B" },
+  { NULL, cwdaily_F_1B_TP, "F_1B_TP", "F_1B_TP:  triple plays at 1B" },
+  { NULL, cwdaily_F_2B_G, "F_2B_G", "F_2B_G:   games at 2B" },
+  { NULL, cwdaily_F_2B_GS, "F_2B_GS", "F_2B_GS:  games started at 2B" },
+  { NULL, cwdaily_F_2B_OUT, "F_2B_OUT", "F_2B_OUT: outs recorded at 2B (innings fielded times 3)" },
+  { NULL, cwdaily_F_2B_TC, "F_2B_TC", "F_2B_TC:  total chances at 2B" },
+  { NULL, cwdaily_F_2B_PO, "F_2B_PO", "F_2B_PO:  putouts at 2B" },
+  { NULL, cwdaily_F_2B_A, "F_2B_A", "F_2B_A:   assists at 2B" },
+  { NULL, cwdaily_F_2B_E, "F_2B_E", "F_2B_E:   errors at 2B" },
+  { NULL, cwdaily_F_2B_DP, "F_2B_DP", "F_2B_DP:  double plays at 2B" },
+  { NULL, cwdaily_F_2B_TP, "F_2B_TP", "F_2B_TP:  triple plays at 2B" },
+  { NULL, cwdaily_F_3B_G, "F_3B_G", "F_3B_G:   games at 3B" },
+  { NULL, cwdaily_F_3B_GS, "F_3B_GS", "F_3B_GS:  games started at 3B" },
+  { NULL, cwdaily_F_3B_OUT, "F_3B_OUT", "F_3B_OUT: outs recorded at 3B (innings fielded times 3)" },
+  { NULL, cwdaily_F_3B_TC, "F_3B_TC", "F_3B_TC:  total chances at 3B" },
+  { NULL, cwdaily_F_3B_PO, "F_3B_PO", "F_3B_PO:  putouts at 3B" },
+  { NULL, cwdaily_F_3B_A, "F_3B_A", "F_3B_A:   assists at 3B" },
+  { NULL, cwdaily_F_3B_E, "F_3B_E", "F_3B_E:   errors at 3B" },
+  { NULL, cwdaily_F_3B_DP, "F_3B_DP", "F_3B_DP:  double plays at 3B" },
+  { NULL, cwdaily_F_3B_TP, "F_3B_TP", "F_3B_TP:  triple plays at 3B" },
+  { NULL, cwdaily_F_SS_G, "F_SS_G", "F_SS_G:    games at SS" },
+  { NULL, cwdaily_F_SS_GS, "F_SS_GS", "F_SS_GS:  games started at SS" },
+  { NULL, cwdaily_F_SS_OUT, "F_SS_OUT", "F_SS_OUT: outs recorded at SS (innings fielded times 3)" },
+  { NULL, cwdaily_F_SS_TC, "F_SS_TC", "F_SS_TC:  total chances at SS" },
+  { NULL, cwdaily_F_SS_PO, "F_SS_PO", "F_SS_PO:  putouts at SS" },
+  { NULL, cwdaily_F_SS_A, "F_SS_A", "F_SS_A:   assists at SS" },
+  { NULL, cwdaily_F_SS_E, "F_SS_E", "F_SS_E:   errors at SS" },
+  { NULL, cwdaily_F_SS_DP, "F_SS_DP", "F_SS_DP:  double plays at SS" },
+  { NULL, cwdaily_F_SS_TP, "F_SS_TP", "F_SS_TP:  triple plays at SS" },
+  { NULL, cwdaily_F_LF_G, "F_LF_G", "F_LF_G:   games at LF" },
+  { NULL, cwdaily_F_LF_GS, "F_LF_GS", "F_LF_GS:  games started at LF" },
+  { NULL, cwdaily_F_LF_OUT, "F_LF_OUT", "F_LF_OUT: outs recorded at LF (innings fielded times 3)" },
+  { NULL, cwdaily_F_LF_TC, "F_LF_TC", "F_LF_TC:  total chances at LF" },
+  { NULL, cwdaily_F_LF_PO, "F_LF_PO", "F_LF_PO:  putouts at LF" },
+  { NULL, cwdaily_F_LF_A, "F_LF_A", "F_LF_A:   assists at LF" },
+  { NULL, cwdaily_F_LF_E, "F_LF_E", "F_LF_E:   errors at LF" },
+  { NULL, cwdaily_F_LF_DP, "F_LF_DP", "F_LF_DP:  double plays at LF" },
+  { NULL, cwdaily_F_LF_TP, "F_LF_TP", "F_LF_TP:  triple plays at LF" },
+  { NULL, cwdaily_F_CF_G, "F_CF_G", "F_CF_G:   games at CF" },
+  { NULL, cwdaily_F_CF_GS, "F_CF_GS", "F_CF_GS:  games started at CF" },
+  { NULL, cwdaily_F_CF_OUT, "F_CF_OUT", "F_CF_OUT: outs recorded at CF (innings fielded times 3)" },
+  { NULL, cwdaily_F_CF_TC, "F_CF_TC", "F_CF_TC:  total chances at CF" },
+  { NULL, cwdaily_F_CF_PO, "F_CF_PO", "F_CF_PO:  putouts at CF" },
+  { NULL, cwdaily_F_CF_A, "F_CF_A", "F_CF_A:   assists at CF" },
+  { NULL, cwdaily_F_CF_E, "F_CF_E", "F_CF_E:   errors at CF" },
+  { NULL, cwdaily_F_CF_DP, "F_CF_DP", "F_CF_DP:  double plays at CF" },
+  { NULL, cwdaily_F_CF_TP, "F_CF_TP", "F_CF_TP:  triple plays at CF" },
+  { NULL, cwdaily_F_RF_G, "F_RF_G", "F_RF_G:   games at RF" },
+  { NULL, cwdaily_F_RF_GS, "F_RF_GS", "F_RF_GS:  games started at RF" },
+  { NULL, cwdaily_F_RF_OUT, "F_RF_OUT", "F_RF_OUT: outs recorded at RF (innings fielded times 3)" },
+  { NULL, cwdaily_F_RF_TC, "F_RF_TC", "F_RF_TC:  total chances at RF" },
+  { NULL, cwdaily_F_RF_PO, "F_RF_PO", "F_RF_PO:  putouts at RF" },
+  { NULL, cwdaily_F_RF_A, "F_RF_A", "F_RF_A:   assists at RF" },
+  { NULL, cwdaily_F_RF_E, "F_RF_E", "F_RF_E:   errors at RF" },
+  { NULL, cwdaily_F_RF_DP, "F_RF_DP", "F_RF_DP:  double plays at RF" },
+  { NULL, cwdaily_F_RF_TP, "F_RF_TP", "F_RF_TP:  triple plays at RF" }
 };
 
 
+/*************************************************************************
+ * Totals over groups of player-games (--group-by and --merge)
+ *************************************************************************/
+
+/*
+ * A total is identified by its key, which is the text of the key columns
+ * as they appear in the output.  'stats' is indexed by field number.
+ * Null values are skipped in summing, as SQL SUM() does, so that a
+ * total is null (negative) only if every value summed into it is null.
+ */
+typedef struct cwdaily_total_struct {
+  char *key;
+  int *stats;
+  struct cwdaily_total_struct *next;
+} CWDailyTotal;
+
+/* Hash table of totals, chained through 'next' */
+CWDailyTotal **totals = NULL;
+int num_buckets = 0, num_totals = 0;
+
+static unsigned long
+cwdaily_hash(char *key)
+{
+  unsigned long hash = 5381;
+  while (*key) {
+    hash = hash * 33 + (unsigned char) *(key++);
+  }
+  return hash;
+}
+
+static void
+cwdaily_totals_resize(int buckets)
+{
+  CWDailyTotal **table = (CWDailyTotal **) calloc(buckets, sizeof(CWDailyTotal *));
+  int i;
+
+  for (i = 0; i < num_buckets; i++) {
+    CWDailyTotal *total = totals[i];
+    while (total != NULL) {
+      CWDailyTotal *next = total->next;
+      unsigned long h = cwdaily_hash(total->key) % buckets;
+      total->next = table[h];
+      table[h] = total;
+      total = next;
+    }
+  }
+  free(totals);
+  totals = table;
+  num_buckets = buckets;
+}
+
+/* Find the total for 'key', creating an all-null total if there is none */
+CWDailyTotal *
+cwdaily_total_find(char *key)
+{
+  CWDailyTotal *total;
+  unsigned long h;
+  int i;
+
+  if (num_buckets == 0) {
+    cwdaily_totals_resize(1024);
+  }
+
+  h = cwdaily_hash(key) % num_buckets;
+  for (total = totals[h]; total != NULL; total = total->next) {
+    if (!strcmp(total->key, key)) {
+      return total;
+    }
+  }
+
+  if (num_totals >= 2 * num_buckets) {
+    cwdaily_totals_resize(4 * num_buckets);
+    h = cwdaily_hash(key) % num_buckets;
+  }
+
+  total = (CWDailyTotal *) malloc(sizeof(CWDailyTotal));
+  total->key = (char *) malloc(sizeof(char) * (strlen(key) + 1));
+  strcpy(total->key, key);
+  total->stats = (int *) malloc(sizeof(int) * (max_field + 1));
+  for (i = 0; i <= max_field; i++) {
+    total->stats[i] = -1;
+  }
+  total->next = totals[h];
+  totals[h] = total;
+  num_totals++;
+  return total;
+}
+
+static void
+cwdaily_total_add(CWDailyTotal *total, int field, int value)
+{
+  if (value < 0) {
+    return;
+  }
+  total->stats[field] = (total->stats[field] < 0) ?
+    value : total->stats[field] + value;
+}
+
+/*
+ * Write the text of the key columns selected by 'group_keys' into
+ * 'buffer', which holds 'size' characters.  'values' holds the unquoted
+ * value of every key.  Returns zero if the key does not fit.
+ */
+static int
+cwdaily_format_key(char *buffer, size_t size, char *values[])
+{
+  size_t len = 0;
+  int k, n, comma = 0;
+
+  *buffer = '\0';
+  for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+    if (group_keys[k]) {
+      n = snprintf(buffer + len, size - len,
+		   (k == 3) ? "%s%s" : "%s\"%s\"",
+		   (comma) ? "," : "", values[k]);
+      if (n < 0 || (size_t) n >= size - len) {
+	return 0;
+      }
+      len += n;
+      comma = 1;
+    }
+  }
+  return 1;
+}
+
+void
+cwdaily_accumulate_game(CWGameIterator *gameiter, CWBoxscore *box)
+{
+  char key[256], season[5], home_fl[2];
+  char *values[CWDAILY_NUM_KEYS], *tmp;
+  char *team_ids[2];
+  int i, j, t;
+  CWBoxPlayer *player;
+
+  tmp = cw_game_info_lookup(gameiter->game, "date");
+  strncpy(season, (tmp) ? tmp : "", 4);
+  season[4] = '\0';
+  tmp = cw_game_info_lookup(gameiter->game, "visteam");
+  team_ids[0] = (tmp) ? tmp : "";
+  tmp = cw_game_info_lookup(gameiter->game, "hometeam");
+  team_ids[1] = (tmp) ? tmp : "";
+  tmp = cw_game_info_lookup(gameiter->game, "site");
+
+  values[0] = season;
+  values[3] = home_fl;
+  values[5] = (tmp) ? tmp : "";
+
+  for (t = 0; t <= 1; t++) {
+    values[1] = team_ids[t];
+    values[4] = team_ids[1-t];
+    sprintf(home_fl, "%d", t);
+
+    for (j = 0; j <= 9; j++) {
+      for (player = cw_box_get_starter(box, t, j); player != NULL;
+	   player = player->next) {
+	CWDailyTotal *total;
+
+	values[2] = player->player_id;
+	if (!cwdaily_format_key(key, sizeof(key), values)) {
+	  fprintf(stderr, "Warning: key for player '%s' is too long; skipping\n",
+		  player->player_id);
+	  continue;
+	}
+	total = cwdaily_total_find(key);
+	for (i = 0; i <= max_field; i++) {
+	  if (fields[i] && field_data[i].s) {
+	    cwdaily_total_add(total, i,
+			      (*field_data[i].s)(gameiter, box, t, player));
+	  }
+	}
+      }
+    }
+  }
+}
+
+static int
+cwdaily_compare_totals(const void *a, const void *b)
+{
+  return strcmp((*(CWDailyTotal **) a)->key, (*(CWDailyTotal **) b)->key);
+}
+
+/* Output all totals, sorted by key, and free them.  Totals are always
+ * written in comma-delimited form with a header, so they can be merged. */
+void
+cwdaily_print_totals(void)
+{
+  CWDailyTotal **list = (CWDailyTotal **) malloc(sizeof(CWDailyTotal *) *
+						 (num_totals + 1));
+  int i, k, n = 0, comma = 0;
+
+  for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+    if (group_keys[k]) {
+      printf((comma) ? ",\"%s\"" : "\"%s\"", key_headers[k]);
+      comma = 1;
+    }
+  }
+  for (i = 0; i <= max_field; i++) {
+    if (fields[i] && field_data[i].s) {
+      printf((comma) ? ",\"%s\"" : "\"%s\"", field_data[i].header);
+      comma = 1;
+    }
+  }
+  printf("\n");
+
+  for (k = 0; k < num_buckets; k++) {
+    CWDailyTotal *total;
+    for (total = totals[k]; total != NULL; total = total->next) {
+      list[n++] = total;
+    }
+  }
+  qsort(list, n, sizeof(CWDailyTotal *), cwdaily_compare_totals);
+
+  for (k = 0; k < n; k++) {
+    char output_line[4096], *buf = output_line;
+
+    buf += sprintf(buf, "%s", list[k]->key);
+    comma = (list[k]->key[0] != '\0');
+    for (i = 0; i <= max_field; i++) {
+      if (fields[i] && field_data[i].s) {
+	if (comma) {
+	  *(buf++) = ',';
+	}
+	comma = 1;
+	buf += cwdaily_print_integer_or_null(buf, list[k]->stats[i]);
+      }
+    }
+    printf("%s\n", output_line);
+
+    free(list[k]->key);
+    free(list[k]->stats);
+    free(list[k]);
+  }
+
+  free(list);
+  free(totals);
+  totals = NULL;
+  num_buckets = num_totals = 0;
+}
+
+/*
+ * Add the totals in 'filename', previously written by cwdaily --group-by,
+ * to the current totals.  The first file read determines the columns;
+ * every file must have the same header.  If keys were given with --group-by,
+ * they must be a subset of the keys in the files, which are then
+ * combined over the remaining keys.
+ */
+void
+cwdaily_merge_totals(char *filename, char *first_header)
+{
+  FILE *file = fopen(filename, "r");
+  char line[8192], header[8192], key[256], *tok;
+  char *values[CWDAILY_NUM_KEYS];
+  int columns[512], num_columns = 0, i, k;
+
+  if (file == NULL) {
+    fprintf(stderr, "Warning: could not open file '%s'\n", filename);
+    return;
+  }
+  if (fgets(header, 8192, file) == NULL) {
+    fclose(file);
+    return;
+  }
+
+  if (first_header[0] == '\0') {
+    int file_keys[CWDAILY_NUM_KEYS] = { 0, 0, 0, 0, 0, 0 };
+    int have_keys = 0;
+
+    strcpy(first_header, header);
+    for (i = 0; i <= max_field; i++) {
+      fields[i] = 0;
+    }
+    strcpy(line, header);
+    for (tok = cw_strtok(line); tok != NULL; tok = cw_strtok(NULL)) {
+      for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+	if (!strcmp(tok, key_headers[k])) {
+	  file_keys[k] = 1;
+	  break;
+	}
+      }
+      if (k == CWDAILY_NUM_KEYS) {
+	for (i = 0; i <= max_field; i++) {
+	  if (field_data[i].s && !strcmp(tok, field_data[i].header)) {
+	    fields[i] = 1;
+	    break;
+	  }
+	}
+	if (i > max_field) {
+	  fprintf(stderr, "*** Unknown column '%s' in '%s'.\n", tok, filename);
+	  exit(1);
+	}
+      }
+    }
+
+    for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+      have_keys = have_keys || group_keys[k];
+    }
+    for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+      if (!have_keys) {
+	group_keys[k] = file_keys[k];
+      }
+      else if (group_keys[k] && !file_keys[k]) {
+	fprintf(stderr, "*** Key '%s' does not appear in '%s'.\n",
+		key_names[k], filename);
+	exit(1);
+      }
+    }
+  }
+  else if (strcmp(header, first_header)) {
+    fprintf(stderr, "*** File '%s' does not have the same columns as the first file.\n",
+	    filename);
+    exit(1);
+  }
+
+  /* Map each column either to a key (-1 - key number) or to a field */
+  strcpy(line, header);
+  for (tok = cw_strtok(line); tok != NULL && num_columns < 512;
+       tok = cw_strtok(NULL)) {
+    for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+      if (!strcmp(tok, key_headers[k])) {
+	break;
+      }
+    }
+    if (k < CWDAILY_NUM_KEYS) {
+      columns[num_columns++] = -1 - k;
+    }
+    else {
+      for (i = 0; i <= max_field && strcmp(tok, field_data[i].header); i++);
+      columns[num_columns++] = i;
+    }
+  }
+
+  while (fgets(line, 8192, file) != NULL) {
+    int stats[512];
+    CWDailyTotal *total;
+
+    for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+      values[k] = "";
+    }
+    tok = cw_strtok(line);
+    for (i = 0; i < num_columns; i++) {
+      if (columns[i] < 0) {
+	values[-1 - columns[i]] = (tok) ? tok : "";
+      }
+      else {
+	stats[i] = (tok && *tok != '\0') ? cw_atoi(tok, NULL) : -1;
+      }
+      tok = cw_strtok(NULL);
+    }
+
+    if (!cwdaily_format_key(key, sizeof(key), values)) {
+      fprintf(stderr, "*** Key columns too long in '%s'.\n", filename);
+      exit(1);
+    }
+    total = cwdaily_total_find(key);
+    for (i = 0; i < num_columns; i++) {
+      if (columns[i] >= 0) {
+	cwdaily_total_add(total, columns[i], stats[i]);
+      }
+    }
+  }
+
+  fclose(file);
+}
+
 void cwdaily_process_game(CWGame *game, CWRoster *visitors, CWRoster *home)
 {
   char *buf;
@@ -698,6 +1082,17 @@ void cwdaily_process_game(CWGame *game, CWRoster *visitors, CWRoster *home)
   CWGameIterator *gameiter = cw_gameiter_create(game);
   CWBoxscore *box = cw_box_create(game);
   CWBoxPlayer *player;
+
+  if (aggregate) {
+    /* Statistical fields depend only on the boxscore, so there is no
+     * need to iterate over the game */
+    cwdaily_accumulate_game(gameiter, box);
+    cw_box_cleanup(box);
+    free(box);
+    cw_gameiter_cleanup(gameiter);
+    free(gameiter);
+    return;
+  }
   
   while (gameiter->event != NULL) {
     cw_gameiter_next(gameiter);
@@ -720,9 +1115,16 @@ void cwdaily_process_game(CWGame *game, CWRoster *visitors, CWRoster *home)
 	    else {
 	      comma = 1;
 	    }
-	    buf += (*field_data[i].f)(buf, gameiter, box,
-				      t, j, seq, player,
-				      visitors, home);
+	    if (field_data[i].f) {
+	      buf += (*field_data[i].f)(buf, gameiter, box,
+					t, j, seq, player,
+					visitors, home);
+	    }
+	    else {
+	      buf += cwdaily_print_integer_or_null(buf,
+						   (*field_data[i].s)(gameiter, box,
+								      t, player));
+	    }
 	  }
 	}
 	printf("%s\n", output_line);
@@ -732,6 +1134,8 @@ void cwdaily_process_game(CWGame *game, CWRoster *visitors, CWRoster *home)
     }
   }
 
+  cw_box_cleanup(box);
+  free(box);
   cw_gameiter_cleanup(gameiter);
   free(gameiter);
 }
@@ -755,7 +1159,15 @@ void cwdaily_print_help(void)
   fprintf(stderr, "              Default is 0-153\n");
   fprintf(stderr, "  -d        print list of field numbers and descriptions\n");
   fprintf(stderr, "  -q        operate quietly; do not output progress messages\n");
-  fprintf(stderr, "  -n        print field names in first row of output\n\n");
+  fprintf(stderr, "  -n        print field names in first row of output\n");
+  fprintf(stderr, "  --group-by keys  output totals of the statistical fields over\n");
+  fprintf(stderr, "              all games, one row per combination of the keys given\n");
+  fprintf(stderr, "              (comma-separated list of season, team, player, home,\n");
+  fprintf(stderr, "              opponent, park).  Null values are skipped in\n");
+  fprintf(stderr, "              totals; a total is null only if all its values are.\n");
+  fprintf(stderr, "  --merge file...  combine totals files written using --group-by,\n");
+  fprintf(stderr, "              instead of processing event files.  If --group-by is\n");
+  fprintf(stderr, "              also given, it must precede --merge.\n\n");
 
   exit(0);
 }
@@ -802,7 +1214,7 @@ cwdaily_initialize(void)
   char output_line[4096];
   char *buf;
 
-  if (!ascii || !print_header) {
+  if (!ascii || !print_header || aggregate) {
     return;
   }
 
@@ -830,6 +1242,9 @@ void (*cwtools_initialize)(void) = cwdaily_initialize;
 void
 cwdaily_cleanup(void)
 {
+  if (aggregate) {
+    cwdaily_print_totals();
+  }
 }
 
 void (*cwtools_cleanup)(void) = cwdaily_cleanup;
@@ -843,6 +1258,32 @@ extern int quiet;
 extern void
 cwtools_parse_field_list(char *text, int max_field, int *fields);
 
+/* Parse the comma-separated list of keys given to --group-by */
+void
+cwdaily_parse_group_keys(char *text)
+{
+  char *tok;
+  int k;
+
+  for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+    group_keys[k] = 0;
+  }
+
+  for (tok = strtok(text, ","); tok != NULL; tok = strtok(NULL, ",")) {
+    for (k = 0; k < CWDAILY_NUM_KEYS; k++) {
+      if (!strcmp(tok, key_names[k])) {
+	group_keys[k] = 1;
+	break;
+      }
+    }
+    if (k == CWDAILY_NUM_KEYS) {
+      fprintf(stderr, "*** Invalid key '%s' for --group-by.\n", tok);
+      fprintf(stderr, "Keys are season, team, player, home, opponent, park.\n");
+      exit(1);
+    }
+  }
+}
+
 int
 cwdaily_parse_command_line(int argc, char *argv[])
 {
@@ -895,6 +1336,24 @@ cwdaily_parse_command_line(int argc, char *argv[])
 	strncpy(year, argv[i], 5);
       }
     }
+    else if (!strcmp(argv[i], "--group-by")) {
+      if (++i < argc) {
+	cwdaily_parse_group_keys(argv[i]);
+	aggregate = 1;
+      }
+    }
+    else if (!strcmp(argv[i], "--merge")) {
+      /* Merging needs no rosters or event files, so it is done here */
+      char header[8192] = "";
+      if (!quiet) {
+	(*cwtools_print_welcome_message)(argv[0]);
+      }
+      for (i++; i < argc; i++) {
+	cwdaily_merge_totals(argv[i], header);
+      }
+      cwdaily_print_totals();
+      exit(0);
+    }
     else if (argv[i][0] == '-') {
       fprintf(stderr, "*** Invalid option '%s'.\n", argv[i]);
       exit(1);
@@ -69,6 +69,17 @@ char program_name[20] = "cwevent";
 
 int print_header = 0;
 
+/* Event predicates (--batter, --pitcher, etc.); NULL or zero if unused */
+char *filter_batter = NULL, *filter_pitcher = NULL;
+char *filter_fielder = NULL, *filter_runner = NULL;
+
+int filter_event_types = 0, event_types[25];
+int filter_outs = 0, outs_states[3];
+int filter_bases = 0, base_states[8];
+
+/* Player-game index to consult for skipping games (--index) */
+char *index_filename = NULL;
+
 
 /*************************************************************************
  * Utility functions (in some cases, candidates for refactor to cwlib)
@@ -95,6 +106,66 @@ int cwevent_future_runs(CWGameIterator *orig_gameiter)
 }
 
 
+/* Returns nonzero if 'player_id' is the fielder at any of positions 'first'
+ * through 'last' for the team in the field */
+static int
+cwevent_is_fielder(CWGameIterator *gameiter, char *player_id,
+		   int first, int last)
+{
+  int pos;
+
+  for (pos = first; pos <= last; pos++) {
+    char *fielder = gameiter->state->fielders[pos][1-gameiter->state->batting_team];
+    if (fielder && !strcmp(fielder, player_id)) {
+      return 1;
+    }
+  }
+  return 0;
+}
+
+/* Returns nonzero if the current event satisfies all the event predicates.
+ * This is evaluated before any fields are formatted. */
+int cwevent_select_event(CWGameIterator *gameiter)
+{
+  CWGameState *state = gameiter->state;
+
+  if (filter_batter && strcmp(gameiter->event->batter, filter_batter)) {
+    return 0;
+  }
+  if (filter_pitcher &&
+      !cwevent_is_fielder(gameiter, filter_pitcher, 1, 1)) {
+    return 0;
+  }
+  if (filter_fielder &&
+      !cwevent_is_fielder(gameiter, filter_fielder, 2, 9)) {
+    return 0;
+  }
+  if (filter_runner &&
+      strcmp(state->runners[1].runner, filter_runner) &&
+      strcmp(state->runners[2].runner, filter_runner) &&
+      strcmp(state->runners[3].runner, filter_runner)) {
+    return 0;
+  }
+  if (filter_outs && (state->outs < 0 || state->outs > 2 ||
+		      !outs_states[state->outs])) {
+    return 0;
+  }
+  if (filter_bases &&
+      !base_states[(cw_gamestate_base_occupied(state, 3) ? 4 : 0) +
+		   (cw_gamestate_base_occupied(state, 2) ? 2 : 0) +
+		   (cw_gamestate_base_occupied(state, 1) ? 1 : 0)]) {
+    return 0;
+  }
+  if (filter_event_types &&
+      (gameiter->event_data->event_type < 0 ||
+       gameiter->event_data->event_type > 24 ||
+       !event_types[gameiter->event_data->event_type])) {
+    return 0;
+  }
+  return 1;
+}
+
+
 /*************************************************************************
  * Functions to output fields
  *************************************************************************/
@@ -1780,6 +1851,11 @@ cwevent_process_game(CWGame *game, CWRoster *visitors, CWRoster *home)
       continue;
     }
 
+    if (!cwevent_select_event(gameiter)) {
+      cw_gameiter_next(gameiter);
+      continue;
+    }
+
     comma = 0;
     strcpy(output_line, "");
     buf = output_line;
@@ -1839,7 +1915,17 @@ cwevent_print_help(void)
   fprintf(stderr, "              Default is none\n");
   fprintf(stderr, "  -d        print list of field numbers and descriptions\n");
   fprintf(stderr, "  -q        operate quietly; do not output progress messages\n");
-  fprintf(stderr, "  -n        print field names in first row of output\n\n");
+  fprintf(stderr, "  -n        print field names in first row of output\n");
+  fprintf(stderr, "event selection options:\n");
+  fprintf(stderr, "  --batter id      only events with given batter\n");
+  fprintf(stderr, "  --pitcher id     only events with given pitcher\n");
+  fprintf(stderr, "  --fielder id     only events with given player at positions 2-9\n");
+  fprintf(stderr, "  --runner id      only events with given player on base\n");
+  fprintf(stderr, "  --event-type l   only events of the listed types (field 34)\n");
+  fprintf(stderr, "  --outs l         only events with the listed numbers of outs\n");
+  fprintf(stderr, "  --bases l        only events with the listed base states (0-7)\n");
+  fprintf(stderr, "  --index file     use player index built by cwindex to skip games\n");
+  fprintf(stderr, "              Lists are given in the same form as for -f.\n\n");
 
   exit(0);
 }
@@ -1891,6 +1977,47 @@ cwevent_print_welcome_message(char *argv0)
 
 void (*cwtools_print_welcome_message)(char *) = cwevent_print_welcome_message;
 
+extern CWIndex *player_index;
+
+/* Load the index entries for one of the player predicates.  Since all
+ * predicates must hold, any one of them suffices to select games. */
+void
+cwevent_read_index(void)
+{
+  FILE *file;
+  char *player_id = NULL;
+  int role = 0;
+
+  if (filter_batter) {
+    player_id = filter_batter;
+    role = CW_INDEX_BATTER;
+  }
+  else if (filter_pitcher) {
+    player_id = filter_pitcher;
+    role = CW_INDEX_PITCHER;
+  }
+  else if (filter_fielder) {
+    player_id = filter_fielder;
+    role = CW_INDEX_FIELDER;
+  }
+  else if (filter_runner) {
+    player_id = filter_runner;
+    role = CW_INDEX_RUNNER;
+  }
+  else {
+    fprintf(stderr, "Warning: --index has no effect without a player predicate\n");
+    return;
+  }
+
+  if ((file = fopen(index_filename, "r")) == NULL) {
+    fprintf(stderr, "Can't find index file (%s)\n", index_filename);
+    exit(1);
+  }
+  player_index = cw_index_create();
+  cw_index_read(player_index, file, player_id, role);
+  fclose(file);
+}
+
 void
 cwevent_initialize(void)
 {
@@ -1898,6 +2025,10 @@ cwevent_initialize(void)
   char output_line[4096];
   char *buf;
 
+  if (index_filename) {
+    cwevent_read_index();
+  }
+
   if (!ascii || !print_header) {
     return;
   }
@@ -1938,6 +2069,11 @@ void (*cwtools_initialize)(void) = cwevent_initialize;
 void
 cwevent_cleanup(void)
 {
+  if (player_index) {
+    cw_index_cleanup(player_index);
+    free(player_index);
+    player_index = NULL;
+  }
 }
 
 void (*cwtools_cleanup)(void) = cwevent_cleanup;
@@ -1951,6 +2087,57 @@ extern int quiet;
 extern void
 cwtools_parse_field_list(char *text, int max_field, int *fields);
 
+/*
+ * Parse the list of values 'text' given to the event predicate 'option',
+ * in the same form as a field list, setting the entries of 'values' for
+ * those listed.  Exits with an error naming the option if the list is
+ * malformed, or any value lies outside 0 to 'max_value'.
+ */
+void
+cwevent_parse_value_list(char *option, char *text, int max_value,
+			 int *values)
+{
+  char *p = text;
+  int j, err = (*text == '\0');
+
+  for (j = 0; j <= max_value; values[j++] = 0);
+
+  while (!err && *p != '\0') {
+    char *end;
+    long first, last;
+
+    first = last = strtol(p, &end, 10);
+    err = (end == p || !isdigit(*p));
+    p = end;
+    if (!err && *p == '-') {
+      p++;
+      last = strtol(p, &end, 10);
+      err = (end == p || !isdigit(*p));
+      p = end;
+    }
+    if (!err && (first > max_value || last > max_value || last < first)) {
+      err = 1;
+    }
+    if (!err) {
+      for (j = (int) first; j <= (int) last; values[j++] = 1);
+      if (*p == ',' && *(p + 1) != '\0') {
+	p++;
+      }
+      else if (*p != '\0') {
+	err = 1;
+      }
+    }
+  }
+
+  if (err) {
+    fprintf(stderr, "*** Invalid value list '%s' for %s.  Values must be\n",
+	    text, option);
+    fprintf(stderr, "numbers or ranges from 0 to %d, separated by commas.\n",
+	    max_value);
+    exit(1);
+  }
+}
+
 int
 cwevent_parse_command_line(int argc, char *argv[])
 {
@@ -2008,6 +2195,49 @@ cwevent_parse_command_line(int argc, char *argv[])
 	strncpy(year, argv[i], 5);
       }
     }
+    else if (!strcmp(argv[i], "--batter")) {
+      if (++i < argc) {
+	filter_batter = argv[i];
+      }
+    }
+    else if (!strcmp(argv[i], "--pitcher")) {
+      if (++i < argc) {
+	filter_pitcher = argv[i];
+      }
+    }
+    else if (!strcmp(argv[i], "--fielder")) {
+      if (++i < argc) {
+	filter_fielder = argv[i];
+      }
+    }
+    else if (!strcmp(argv[i], "--runner")) {
+      if (++i < argc) {
+	filter_runner = argv[i];
+      }
+    }
+    else if (!strcmp(argv[i], "--event-type")) {
+      if (++i < argc) {
+	cwevent_parse_value_list(argv[i - 1], argv[i], 24, event_types);
+	filter_event_types = 1;
+      }
+    }
+    else if (!strcmp(argv[i], "--outs")) {
+      if (++i < argc) {
+	cwevent_parse_value_list(argv[i - 1], argv[i], 2, outs_states);
+	filter_outs = 1;
+      }
+    }
+    else if (!strcmp(argv[i], "--bases")) {
+      if (++i < argc) {
+	cwevent_parse_value_list(argv[i - 1], argv[i], 7, base_states);
+	filter_bases = 1;
+      }
+    }
+    else if (!strcmp(argv[i], "--index")) {
+      if (++i < argc) {
+	index_filename = argv[i];
+      }
+    }
     else if (argv[i][0] == '-') {
       fprintf(stderr, "*** Invalid option '%s'.\n", argv[i]);
       exit(1);
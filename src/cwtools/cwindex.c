@@ -0,0 +1,126 @@
+/*
+ * This file is part of Chadwick
+ * Copyright (c) 2002-2023, Dr T L Turocy (ted.turocy@gmail.com)
+ *                          Chadwick Baseball Bureau (http://www.chadwick-bureau.com)
+ *
+ * FILE: src/cwtools/cwindex.c
+ * Chadwick player-game index builder
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to the Free Software
+ * Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "cwlib/chadwick.h"
+
+/*
+ * Unlike the other tools, cwindex does not use the common driver in
+ * cwtools.c.  Index records need the position of each game in its
+ * event file, so games are read here one at a time rather than
+ * through a CWScorebook.  No rosters are needed.
+ */
+
+int quiet = 0;
+
+void
+cwindex_print_welcome_message(char *argv0)
+{
+  fprintf(stderr,
+	  "\nChadwick player-game index builder, version " VERSION);
+  fprintf(stderr, "\n  Type '%s -h' for help.\n", argv0);
+  fprintf(stderr, "Copyright (c) 2002-2023\nDr T L Turocy, Chadwick Baseball Bureau (ted.turocy@gmail.com)\n");
+  fprintf(stderr, "This is free software, "
+	  "subject to the terms of the GNU GPL license.\n\n");
+}
+
+void
+cwindex_print_help(void)
+{
+  fprintf(stderr, "\n\ncwindex generates an index of the games and events in which each\n");
+  fprintf(stderr, "player appears as batter, pitcher, fielder, or runner.\n");
+  fprintf(stderr, "The index is used by the --index option of cwevent.\n");
+  fprintf(stderr, "Usage: cwindex [options] eventfile...\n");
+  fprintf(stderr, "options:\n");
+  fprintf(stderr, "  -h        print this help\n");
+  fprintf(stderr, "  -q        operate quietly; do not output progress messages\n\n");
+
+  exit(0);
+}
+
+void
+cwindex_process_file(char *filename)
+{
+  FILE *file = fopen(filename, "r");
+  CWGame *game;
+
+  if (!quiet) {
+    fprintf(stderr, "[Processing file %s.]\n", filename);
+  }
+
+  if (file == NULL) {
+    fprintf(stderr, "Warning: could not open file '%s'\n", filename);
+    return;
+  }
+
+  if (cw_file_find_first_game(file)) {
+    while (!feof(file)) {
+      long offset = ftell(file);
+
+      if ((game = cw_game_read(file)) == NULL) {
+	break;
+      }
+      cw_index_write_game(stdout, filename, offset, game);
+      cw_game_cleanup(game);
+      free(game);
+    }
+  }
+
+  fclose(file);
+}
+
+int
+main(int argc, char *argv[])
+{
+  int i;
+
+  for (i = 1; i < argc; i++) {
+    if (!strcmp(argv[i], "-h")) {
+      cwindex_print_welcome_message(argv[0]);
+      cwindex_print_help();
+    }
+    else if (!strcmp(argv[i], "-q")) {
+      quiet = 1;
+    }
+    else if (argv[i][0] == '-') {
+      fprintf(stderr, "*** Invalid option '%s'.\n", argv[i]);
+      exit(1);
+    }
+    else {
+      break;
+    }
+  }
+
+  if (!quiet) {
+    cwindex_print_welcome_message(argv[0]);
+  }
+
+  for (; i < argc; i++) {
+    cwindex_process_file(argv[i]);
+  }
+
+  return 0;
+}
@@ -81,6 +81,9 @@ int ascii = 1;
 /* If 'quiet', programs should write no status messages to stderr */
 int quiet = 0;
 
+/* If set by a program, only the games listed in the index are read */
+CWIndex *player_index = NULL;
+
 void
 cwtools_read_rosters(CWLeague *league)
 {
@@ -161,11 +164,100 @@ cwtools_iterate_games(CWScorebook *scorebook, CWLeague *league)
   }
 }
 
+static int
+cwtools_compare_index_entries(const void *a, const void *b)
+{
+  long x = (*(CWIndexEntry **) a)->offset, y = (*(CWIndexEntry **) b)->offset;
+  return (x > y) - (x < y);
+}
+
+/*
+ * Process only those games in 'filename' which appear in player_index.
+ * Each game is located directly by its offset in the file, so games
+ * not in the index are neither parsed nor simulated, and files with
+ * no indexed games are not opened at all.
+ */
+void
+cwtools_process_indexed_scorebook(CWLeague *league, char *filename)
+{
+  CWIndexEntry *entry, **entries = NULL;
+  int i, num_entries = 0;
+  FILE *file;
+
+  for (entry = cw_index_file_next(player_index, NULL, filename);
+       entry != NULL;
+       entry = cw_index_file_next(player_index, entry, filename)) {
+    if ((num_entries & 63) == 0) {
+      entries = (CWIndexEntry **) realloc(entries, sizeof(CWIndexEntry *) *
+					  (num_entries + 64));
+    }
+    entries[num_entries++] = entry;
+  }
+
+  if (num_entries == 0) {
+    return;
+  }
+
+  if (!quiet) {
+    fprintf(stderr, "[Processing file %s.]\n", filename);
+  }
+
+  if ((file = fopen(filename, "r")) == NULL) {
+    fprintf(stderr, "Warning: could not open file '%s'\n", filename);
+    free(entries);
+    return;
+  }
+
+  qsort(entries, num_entries, sizeof(CWIndexEntry *),
+	cwtools_compare_index_entries);
+
+  for (i = 0; i < num_entries; i++) {
+    CWGame *game = NULL;
+
+    if (i > 0 && entries[i]->offset == entries[i-1]->offset) {
+      continue;
+    }
+
+    if (fseek(file, entries[i]->offset, SEEK_SET) == 0) {
+      game = cw_game_read(file);
+    }
+    if (game == NULL || strcmp(game->game_id, entries[i]->game_id)) {
+      fprintf(stderr,
+	      "Warning: index entry for game '%s' does not match file '%s'\n",
+	      entries[i]->game_id, filename);
+    }
+    else if (cwtools_select_game(game)) {
+      (*cwtools_process_game)(game,
+			      cw_league_roster_find(league,
+						    cw_game_info_lookup(game,
+									"visteam")),
+			      cw_league_roster_find(league,
+						    cw_game_info_lookup(game,
+									"hometeam")));
+    }
+    if (game != NULL) {
+      cw_game_cleanup(game);
+      free(game);
+    }
+  }
+
+  fclose(file);
+  free(entries);
+}
+
 void
 cwtools_process_scorebook(CWLeague *league, char *filename)
 {
-  CWScorebook *scorebook = cw_scorebook_create();
-  FILE *file = fopen(filename, "r");
+  CWScorebook *scorebook;
+  FILE *file;
+
+  if (player_index != NULL) {
+    cwtools_process_indexed_scorebook(league, filename);
+    return;
+  }
+
+  scorebook = cw_scorebook_create();
+  file = fopen(filename, "r");
 
   if (!quiet) {
     fprintf(stderr, "[Processing file %s.]\n", filename);
@@ -231,6 +323,7 @@ cwtools_parse_field_list(char *text, int maxfield, int *field)
     }
 
     if (firstNum > maxfield) {
+      err = 1;
       break;
     }
 